@@ -3,18 +3,55 @@ Registry Utility - Clean Code Version
 A tool for comparing and backing up Windows Registry files.
 """
 
+from __future__ import annotations
+
+import time
+
+STARTUP_STARTED_AT = time.perf_counter()
+
 import sys
 import os
-import winreg
-from typing import Dict, Tuple, Optional, Callable
-from dataclasses import dataclass
+import re
+import argparse
+import ctypes
+import hashlib
+import marshal
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import wintypes
+from itertools import islice
+from types import SimpleNamespace
+from typing import Dict, Tuple, Optional, Callable, List, Set, Any
+from dataclasses import dataclass, field
 from enum import Enum
 
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QTextEdit, QFileDialog, QMessageBox, QTabWidget
-)
-from PyQt6.QtCore import Qt
+try:
+    import winreg
+except ImportError:
+    # Registry constants only, so parsing and the in-memory registry work on other platforms.
+    winreg = SimpleNamespace(
+        HKEY_CLASSES_ROOT=0x80000000, HKEY_CURRENT_USER=0x80000001, HKEY_LOCAL_MACHINE=0x80000002,
+        HKEY_USERS=0x80000003, HKEY_CURRENT_CONFIG=0x80000005,
+        REG_SZ=1, REG_EXPAND_SZ=2, REG_BINARY=3, REG_DWORD=4, REG_MULTI_SZ=7, REG_QWORD=11,
+        KEY_READ=0x20019, KEY_WRITE=0x20006, KEY_NOTIFY=0x0010,
+    )
+
+try:
+    from PyQt6.QtWidgets import (
+        QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+        QPushButton, QLabel, QTextEdit, QFileDialog, QMessageBox, QTabWidget, QCheckBox,
+        QLineEdit, QTreeWidget, QTreeWidgetItem
+    )
+    from PyQt6.QtCore import Qt, QObject, QEvent, QTimer
+    GUI_AVAILABLE = True
+except ImportError:
+    # Without PyQt6 only the command line modes are available.
+    QMainWindow = QObject = object
+    GUI_AVAILABLE = False
+
+STARTUP_IMPORTED_AT = time.perf_counter()
 
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -38,6 +75,40 @@ REGISTRY_ROOT_KEYS = {
     "HKEY_CURRENT_CONFIG": winreg.HKEY_CURRENT_CONFIG,
 }
 
+REG_NOTIFY_CHANGE_NAME = 0x00000001
+REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+WAIT_OBJECT_0 = 0x00000000
+MAXIMUM_WAIT_OBJECTS = 64
+DRIFT_POLL_INTERVAL_SECONDS = 5.0
+
+CURRENT_USER_ROOT = "HKEY_CURRENT_USER"
+USERS_ROOT = "HKEY_USERS"
+USER_HIVE_EXCLUDED_NAMES = {".DEFAULT"}
+USER_HIVE_CLASSES_SUFFIX = "_Classes"
+MAX_PROFILE_WORKERS = 8
+
+PARSE_CACHE_VERSION = 3
+PARSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+PARSE_CACHE_INDEX_NAME = "index.bin"
+PARSE_CACHE_HASH_CHUNK_SIZE = 1024 * 1024
+
+RESULTS_PAGE_SIZE = 1000
+RESULT_STORE_DISK_THRESHOLD = 100_000
+RESULT_STORE_BATCH_SIZE = 5000
+SEARCH_RESULT_LIMIT = 1000
+SEARCH_DEBOUNCE_MS = 250
+TREE_PLACEHOLDER_TEXT = "Loading..."
+
+HISTORY_DATABASE_NAME = "history.sqlite3"
+HISTORY_BATCH_SIZE = 5000
+HISTORY_REPORT_RUNS = 20
+HISTORY_LOG_DRIFTING_LIMIT = 100
+HISTORY_PROGRESS_STEPS = 100_000
+HISTORY_NOT_COMPARED = "not_compared"
+
+REG_DELETE_VALUE = "-"
+REG_DEFAULT_VALUE_NAME = "@"
+
 class ComparisonStatus(Enum):
     MATCH = "match"
     DIFFERENT = "different"
@@ -62,18 +133,18 @@ class ComparisonResult:
     match_status: str
     system_status: str
 
-@dataclass
-class RegistryKey:
-    root_key: str
-    sub_key_path: str
-    value_name: str
+FILTER_MATCH_STATUSES = {
+    "all": None,
+    "matches": ComparisonStatus.MATCH.value,
+    "differences": ComparisonStatus.DIFFERENT.value,
+    "missing": ComparisonStatus.MISSING.value,
+}
 
 MODERN_DARK_STYLESHEET = """
 QMainWindow {
     background-color: #0A0A0A;
     border: 1px solid #2A2A2A;
     border-radius: 15px;
-    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.4);
 }
 
 QWidget {
@@ -82,7 +153,6 @@ QWidget {
     font-family: "Roboto", "Segoe UI", "Arial", sans-serif;
     font-size: 11pt;
     border-radius: 10px;
-    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.2);
 }
 
 QPushButton {
@@ -101,7 +171,6 @@ QPushButton {
 QPushButton:hover {
     background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
     stop:0 #7AADF8, stop:1 #6A8BD8);
-    transform: translateY(-2px);
 }
 
 QPushButton:pressed {
@@ -227,6 +296,21 @@ def validate_reg_file_format(content: str) -> None:
     if not lines or REG_FILE_HEADER not in lines[0]:
         raise ValueError("Invalid or unsupported .reg file format.")
 
+def join_continuation_lines(content: str) -> List[str]:
+    """Split content into stripped lines, joining the hex values regedit wraps with a trailing backslash."""
+    lines = []
+    pending = ""
+    for line in content.splitlines():
+        line = pending + line.strip()
+        pending = ""
+        if line.endswith((',\\', ':\\')) and not line.startswith(';'):
+            pending = line[:-1]
+        else:
+            lines.append(line)
+    if pending:
+        lines.append(pending)
+    return lines
+
 def parse_registry_line(line: str) -> Tuple[Optional[str], Optional[str]]:
     """Parse a single registry line into key-value pair."""
     if '=' not in line:
@@ -238,30 +322,175 @@ def parse_registry_line(line: str) -> Tuple[Optional[str], Optional[str]]:
     except ValueError:
         return None, None
 
+def registry_path_key(path: str) -> str:
+    """Get the case-insensitive lookup key of a registry path or value name."""
+    return sys.intern(path.casefold())
+
 def parse_reg_file(file_path: str) -> Dict[str, Dict[str, str]]:
-    """Parse a .reg file and return registry settings."""
+    """Parse a .reg file and return registry settings, merging repeated sections case-insensitively like regedit."""
     content = read_file_with_encoding_fallback(file_path)
     validate_reg_file_format(content)
     
     registry_settings = {}
+    sections = {}
     current_path = ""
+    current_values = None
+    current_names = None
     
-    for line in content.splitlines():
-        line = line.strip()
-
+    for line in join_continuation_lines(content):
         if not line or line.startswith(";"):
             continue
             
         if is_registry_path_line(line):
             current_path = extract_registry_path(line)
-            registry_settings[current_path] = {}
+            path_key = registry_path_key(current_path)
+            if path_key not in sections:
+                sections[path_key] = registry_settings[sys.intern(current_path)] = {}, {}
+            current_values, current_names = sections[path_key]
         elif current_path:
             key, value = parse_registry_line(line)
             if key and value:
-                registry_settings[current_path][key] = value
+                key = current_names.setdefault(key.casefold(), key)
+                current_values[key] = value
     
+    for path, (values, _) in registry_settings.items():
+        registry_settings[path] = values
     return registry_settings
 
+def default_app_data_dir() -> str:
+    """Get the per-user directory for the application's local data."""
+    base_dir = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_dir, "RegUtility")
+
+def default_parse_cache_dir() -> str:
+    """Get the per-user directory used for the parse cache."""
+    return os.path.join(default_app_data_dir(), "parse_cache")
+
+def hash_file_content(file_path: str) -> str:
+    """Compute a content digest of a file."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(PARSE_CACHE_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ParseCache:
+    """On-disk LRU cache of parsed .reg files keyed by path, size, mtime and content hash."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or default_parse_cache_dir()
+        self.max_bytes = max_bytes
+        self.last_hit = False
+        self._index_path = os.path.join(self.cache_dir, PARSE_CACHE_INDEX_NAME)
+
+    def load(self, file_path: str,
+             log_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Dict[str, str]]:
+        """Return the parsed settings of a .reg file, parsing only on a cache miss; cache write failures are logged."""
+        log_callback = log_callback or (lambda message: None)
+        self.last_hit = False
+        index = self._read_index()
+        path_key = os.path.normcase(os.path.abspath(file_path))
+        stat = os.stat(file_path)
+        known = index["files"].get(path_key)
+
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            digest = known[2]
+        else:
+            digest = hash_file_content(file_path)
+
+        settings = self._read_entry(digest) if digest in index["entries"] else None
+        if settings is None:
+            settings = parse_reg_file(file_path)
+            if not self._write_entry(index, digest, settings, log_callback):
+                return settings
+        else:
+            self.last_hit = True
+
+        index["files"][path_key] = (stat.st_size, stat.st_mtime_ns, digest)
+        index["entries"][digest]["last_used"] = time.time()
+        self._evict(index)
+        self._write_index(index, log_callback)
+        return settings
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        index = self._read_index()
+        for digest in list(index["entries"]):
+            self._remove_entry(index, digest)
+        self._write_index(index)
+
+    def _entry_path(self, digest: str) -> str:
+        """Get the data file path of a cache entry."""
+        return os.path.join(self.cache_dir, f"{digest}.bin")
+
+    def _read_index(self) -> Dict[str, Any]:
+        """Load the cache index, starting fresh if it is missing or from another version."""
+        try:
+            with open(self._index_path, 'rb') as file:
+                index = marshal.loads(file.read())
+            if index.get("version") == PARSE_CACHE_VERSION:
+                return index
+        except (OSError, EOFError, ValueError, TypeError, AttributeError):
+            pass
+        return {"version": PARSE_CACHE_VERSION, "entries": {}, "files": {}}
+
+    def _write_index(self, index: Dict[str, Any], log_callback: Optional[Callable[[str], None]] = None) -> None:
+        """Atomically replace the cache index."""
+        try:
+            self._write_atomically(self._index_path, marshal.dumps(index))
+        except OSError as e:
+            if log_callback:
+                log_callback(f"Warning: Could not update the parse cache index: {e}")
+
+    def _read_entry(self, digest: str) -> Optional[Dict[str, Dict[str, str]]]:
+        """Load a cached parse result, or None if it is unreadable."""
+        try:
+            with open(self._entry_path(digest), 'rb') as file:
+                return marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def _write_entry(self, index: Dict[str, Any], digest: str, settings: Dict[str, Dict[str, str]],
+                     log_callback: Callable[[str], None]) -> bool:
+        """Store a parse result; returns False if the cache could not be written."""
+        data = marshal.dumps(settings)
+        if len(data) > self.max_bytes:
+            return False
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_atomically(self._entry_path(digest), data)
+        except OSError as e:
+            log_callback(f"Warning: Could not write the parse cache: {e}")
+            return False
+        index["entries"][digest] = {"bytes": len(data), "last_used": time.time()}
+        return True
+
+    def _write_atomically(self, target_path: str, data: bytes) -> None:
+        """Write a file through a temporary file so readers never see partial data."""
+        temp_path = f"{target_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, target_path)
+
+    def _evict(self, index: Dict[str, Any]) -> None:
+        """Drop least recently used entries until the cache fits its size cap."""
+        entries = index["entries"]
+        total_bytes = sum(entry["bytes"] for entry in entries.values())
+        for digest in sorted(entries, key=lambda d: entries[d]["last_used"]):
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= entries[digest]["bytes"]
+            self._remove_entry(index, digest)
+
+    def _remove_entry(self, index: Dict[str, Any], digest: str) -> None:
+        """Delete a cache entry and every path that refers to it."""
+        index["entries"].pop(digest, None)
+        index["files"] = {path: known for path, known in index["files"].items() if known[2] != digest}
+        try:
+            os.remove(self._entry_path(digest))
+        except OSError:
+            pass
+
 def is_registry_path_line(line: str) -> bool:
     """Check if line represents a registry path."""
     return line.startswith('[') and line.endswith(']')
@@ -274,17 +503,328 @@ def is_windows_system() -> bool:
     """Check if running on Windows."""
     return os.name == 'nt'
 
-def parse_registry_key_path(full_key_path: str) -> RegistryKey:
-    """Parse full registry key path into components."""
-    parts = full_key_path.split('\\')
-    root_key = parts[0]
-    sub_key_path = '\\'.join(parts[1:-1])
-    value_name = parts[-1]
-    return RegistryKey(root_key, sub_key_path, value_name)
-
 def get_registry_root_key(root_key_str: str) -> Optional[int]:
-    """Get Windows registry root key constant."""
-    return REGISTRY_ROOT_KEYS.get(root_key_str)
+    """Get Windows registry root key constant; root key names are case-insensitive."""
+    return REGISTRY_ROOT_KEYS.get(root_key_str.upper())
+
+def split_registry_key_path(key_path: str) -> Tuple[str, str]:
+    """Split a key path (without value name) into root key and sub key path."""
+    root_key, _, sub_key_path = key_path.partition('\\')
+    return root_key, sub_key_path
+
+class WinregChangeNotifier:
+    """Change notifications for registry keys via RegNotifyChangeKeyValue."""
+
+    def __init__(self):
+        self._advapi32 = ctypes.windll.advapi32
+        self._kernel32 = ctypes.windll.kernel32
+        self._advapi32.RegNotifyChangeKeyValue.argtypes = [
+            wintypes.HANDLE, wintypes.BOOL, wintypes.DWORD, wintypes.HANDLE, wintypes.BOOL
+        ]
+        self._advapi32.RegNotifyChangeKeyValue.restype = wintypes.LONG
+        self._kernel32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        self._kernel32.CreateEventW.restype = wintypes.HANDLE
+        self._kernel32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD
+        ]
+        self._kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        self._kernel32.ResetEvent.argtypes = [wintypes.HANDLE]
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._watches: Dict[str, Tuple[Any, int]] = {}
+
+    def watch(self, token: str, root_key: int, sub_key_path: str) -> bool:
+        """Start watching a key; returns False if the key cannot be watched."""
+        try:
+            key_handle = winreg.OpenKey(root_key, sub_key_path, 0, winreg.KEY_NOTIFY)
+        except OSError:
+            return False
+        event = self._kernel32.CreateEventW(None, True, False, None)
+        if not event:
+            key_handle.Close()
+            return False
+        if not self._arm(key_handle, event):
+            self._kernel32.CloseHandle(event)
+            key_handle.Close()
+            return False
+        self._watches[token] = (key_handle, event)
+        return True
+
+    def is_watching(self, token: str) -> bool:
+        """Check whether a key is still being watched."""
+        return token in self._watches
+
+    def poll(self) -> Set[str]:
+        """Return the tokens of watched keys that changed since the last poll."""
+        changed = set()
+        tokens = list(self._watches)
+        for start in range(0, len(tokens), MAXIMUM_WAIT_OBJECTS):
+            pending = tokens[start:start + MAXIMUM_WAIT_OBJECTS]
+            while pending:
+                handles = (wintypes.HANDLE * len(pending))(*(self._watches[token][1] for token in pending))
+                index = self._kernel32.WaitForMultipleObjects(len(pending), handles, False, 0) - WAIT_OBJECT_0
+                if index < 0 or index >= len(pending):
+                    break
+                token = pending.pop(index)
+                changed.add(token)
+                self._rearm(token)
+        return changed
+
+    def close(self) -> None:
+        """Release all notification handles."""
+        for token in list(self._watches):
+            self._unwatch(token)
+
+    def _arm(self, key_handle, event: int) -> bool:
+        """Request an asynchronous notification for the next change to a key."""
+        result = self._advapi32.RegNotifyChangeKeyValue(
+            key_handle.handle, False, REG_NOTIFY_CHANGE_NAME | REG_NOTIFY_CHANGE_LAST_SET, event, True
+        )
+        return result == 0
+
+    def _rearm(self, token: str) -> None:
+        """Reset a signalled event and re-register it, dropping keys that were deleted."""
+        key_handle, event = self._watches[token]
+        self._kernel32.ResetEvent(event)
+        if not self._arm(key_handle, event):
+            self._unwatch(token)
+
+    def _unwatch(self, token: str) -> None:
+        """Stop watching a key."""
+        key_handle, event = self._watches.pop(token)
+        self._kernel32.CloseHandle(event)
+        key_handle.Close()
+
+class WinregBackend:
+    """Registry backend that talks to the live Windows Registry."""
+
+    def resolve_root(self, root_key_str: str) -> Optional[int]:
+        """Resolve a root key name to a handle."""
+        return get_registry_root_key(root_key_str)
+
+    def open_key(self, root_key: int, sub_key_path: str):
+        """Open a key for reading; raises FileNotFoundError if it does not exist."""
+        return winreg.OpenKey(root_key, sub_key_path, 0, winreg.KEY_READ)
+
+    def query_value(self, key_handle, value_name: str) -> Tuple[Any, int]:
+        """Query a value from an open key."""
+        return winreg.QueryValueEx(key_handle, value_name)
+
+    def close_key(self, key_handle) -> None:
+        """Close a key handle returned by this backend."""
+        key_handle.Close()
+
+    def read_value(self, root_key: int, sub_key_path: str, value_name: str) -> Tuple[Any, int]:
+        """Read a single value and its type."""
+        with self.open_key(root_key, sub_key_path) as key_handle:
+            return self.query_value(key_handle, value_name)
+
+    def key_timestamp(self, root_key: int, sub_key_path: str) -> Optional[int]:
+        """Get the last write time of a key, or None if it does not exist."""
+        try:
+            with self.open_key(root_key, sub_key_path) as key_handle:
+                return winreg.QueryInfoKey(key_handle)[2]
+        except OSError:
+            return None
+
+    def list_subkeys(self, root_key: int, sub_key_path: str) -> List[str]:
+        """List the names of the direct subkeys of a key."""
+        with self.open_key(root_key, sub_key_path) as key_handle:
+            subkey_count = winreg.QueryInfoKey(key_handle)[0]
+            return [winreg.EnumKey(key_handle, index) for index in range(subkey_count)]
+
+    def create_key(self, root_key: int, sub_key_path: str):
+        """Open a key for reading and writing, creating it if necessary."""
+        return winreg.CreateKeyEx(root_key, sub_key_path, 0, winreg.KEY_READ | winreg.KEY_WRITE)
+
+    def set_value(self, key_handle, value_name: str, value, reg_type: int) -> None:
+        """Write a value to a key opened with create_key."""
+        winreg.SetValueEx(key_handle, value_name, 0, reg_type, value)
+
+    def delete_value(self, key_handle, value_name: str) -> None:
+        """Delete a value from a key opened with create_key."""
+        winreg.DeleteValue(key_handle, value_name)
+
+    def delete_key(self, root_key: int, sub_key_path: str) -> None:
+        """Delete a key that has no subkeys."""
+        winreg.DeleteKey(root_key, sub_key_path)
+
+    def create_change_notifier(self) -> Optional[WinregChangeNotifier]:
+        """Create a change notifier, or None if notifications are unavailable."""
+        if not is_windows_system():
+            return None
+        try:
+            return WinregChangeNotifier()
+        except (AttributeError, OSError):
+            return None
+
+class InMemoryChangeNotifier:
+    """Change notifier for InMemoryRegistry; only touched keys are reported."""
+
+    def __init__(self):
+        self._tokens_by_key: Dict[Tuple[str, str], Set[str]] = {}
+        self._tokens: Set[str] = set()
+        self._changed: Set[str] = set()
+
+    def watch(self, token: str, root_key: str, sub_key_path: str) -> bool:
+        """Start watching a key, including keys that do not exist yet."""
+        self._tokens_by_key.setdefault(InMemoryRegistry.key_id(root_key, sub_key_path), set()).add(token)
+        self._tokens.add(token)
+        return True
+
+    def is_watching(self, token: str) -> bool:
+        """Check whether a key is still being watched."""
+        return token in self._tokens
+
+    def poll(self) -> Set[str]:
+        """Return the tokens of watched keys that changed since the last poll."""
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def close(self) -> None:
+        """Stop watching all keys."""
+        self._tokens_by_key.clear()
+        self._tokens.clear()
+        self._changed.clear()
+
+    def notify(self, key_id: Tuple[str, str]) -> None:
+        """Record a change to a key."""
+        self._changed.update(self._tokens_by_key.get(key_id, ()))
+
+class InMemoryRegistry:
+    """Dictionary-backed registry stand-in with the same interface as WinregBackend."""
+
+    def __init__(self, notifications: bool = True):
+        self.notifications = notifications
+        self._keys: Dict[Tuple[str, str], Dict[str, Tuple[str, Any, int]]] = {}
+        self._key_names: Dict[Tuple[str, str], str] = {}
+        self._timestamps: Dict[Tuple[str, str], int] = {}
+        self._clock = 0
+        self._notifiers: List[InMemoryChangeNotifier] = []
+
+    @staticmethod
+    def key_id(root_key: str, sub_key_path: str) -> Tuple[str, str]:
+        """Build the case-insensitive identity of a key."""
+        return root_key.upper(), sub_key_path.lower()
+
+    def write_value(self, key_path: str, value_name: str, value, reg_type: int) -> None:
+        """Create or overwrite a value, creating its key if necessary."""
+        key_id = self._ensure_key(*split_registry_key_path(key_path))
+        self._keys[key_id][value_name.lower()] = (value_name, value, reg_type)
+        self._touch(key_id)
+
+    def remove_value(self, key_path: str, value_name: str) -> None:
+        """Delete a value if it exists."""
+        key_id = self.key_id(*split_registry_key_path(key_path))
+        if self._keys.get(key_id, {}).pop(value_name.lower(), None) is not None:
+            self._touch(key_id)
+
+    def remove_key(self, key_path: str) -> None:
+        """Delete a key with its values and subkeys if it exists."""
+        root_id, sub_key_id = self.key_id(*split_registry_key_path(key_path))
+        prefix = f'{sub_key_id}\\'
+        for key_id in [key_id for key_id in self._keys
+                       if key_id[0] == root_id and (key_id[1] == sub_key_id or key_id[1].startswith(prefix))]:
+            del self._keys[key_id]
+            self._key_names.pop(key_id, None)
+            self._timestamps.pop(key_id, None)
+            self._notify(key_id)
+
+    def resolve_root(self, root_key_str: str) -> Optional[str]:
+        """Resolve a root key name; unknown roots resolve to None."""
+        root_key_str = root_key_str.upper()
+        return root_key_str if root_key_str in REGISTRY_ROOT_KEYS else None
+
+    def open_key(self, root_key: str, sub_key_path: str) -> Tuple[str, str]:
+        """Open a key for reading; raises FileNotFoundError if it does not exist."""
+        key_id = self.key_id(root_key, sub_key_path)
+        if key_id not in self._keys:
+            raise FileNotFoundError(f"Key not found: {root_key}\\{sub_key_path}")
+        return key_id
+
+    def query_value(self, key_handle: Tuple[str, str], value_name: str) -> Tuple[Any, int]:
+        """Query a value from an open key."""
+        entry = self._keys.get(key_handle, {}).get(value_name.lower())
+        if entry is None:
+            raise FileNotFoundError(f"Value not found: {value_name}")
+        return entry[1], entry[2]
+
+    def close_key(self, key_handle: Tuple[str, str]) -> None:
+        """Close a key handle returned by this backend."""
+
+    def create_key(self, root_key: str, sub_key_path: str) -> Tuple[str, str]:
+        """Open a key for reading and writing, creating it if necessary."""
+        return self._ensure_key(root_key, sub_key_path)
+
+    def set_value(self, key_handle: Tuple[str, str], value_name: str, value, reg_type: int) -> None:
+        """Write a value to a key opened with create_key."""
+        if key_handle not in self._keys:
+            raise FileNotFoundError(f"Key not found: {key_handle[0]}\\{key_handle[1]}")
+        self._keys[key_handle][value_name.lower()] = (value_name, value, reg_type)
+        self._touch(key_handle)
+
+    def delete_value(self, key_handle: Tuple[str, str], value_name: str) -> None:
+        """Delete a value from a key opened with create_key."""
+        if self._keys.get(key_handle, {}).pop(value_name.lower(), None) is None:
+            raise FileNotFoundError(f"Value not found: {value_name}")
+        self._touch(key_handle)
+
+    def delete_key(self, root_key: str, sub_key_path: str) -> None:
+        """Delete a key that has no subkeys."""
+        if self.list_subkeys(root_key, sub_key_path):
+            raise PermissionError(f"Key has subkeys: {root_key}\\{sub_key_path}")
+        self.remove_key(f'{root_key}\\{sub_key_path}')
+
+    def read_value(self, root_key: str, sub_key_path: str, value_name: str) -> Tuple[Any, int]:
+        """Read a single value and its type."""
+        return self.query_value(self.open_key(root_key, sub_key_path), value_name)
+
+    def key_timestamp(self, root_key: str, sub_key_path: str) -> Optional[int]:
+        """Get the logical last write time of a key, or None if it does not exist."""
+        return self._timestamps.get(self.key_id(root_key, sub_key_path))
+
+    def list_subkeys(self, root_key: str, sub_key_path: str) -> List[str]:
+        """List the names of the direct subkeys of a key, including implied parents."""
+        root_id, parent = self.key_id(root_key, sub_key_path)
+        prefix = f'{parent}\\' if parent else ''
+        names = {}
+        for (key_root, key_path), original_path in self._key_names.items():
+            if key_root == root_id and key_path.startswith(prefix) and key_path != parent:
+                child = original_path[len(prefix):].split('\\', 1)[0]
+                names.setdefault(child.lower(), child)
+        if not names and (root_id, parent) not in self._keys and parent:
+            raise FileNotFoundError(f"Key not found: {root_key}\\{sub_key_path}")
+        return sorted(names.values())
+
+    def create_change_notifier(self) -> Optional[InMemoryChangeNotifier]:
+        """Create a change notifier, or None if notifications are disabled."""
+        if not self.notifications:
+            return None
+        notifier = InMemoryChangeNotifier()
+        self._notifiers.append(notifier)
+        return notifier
+
+    def _ensure_key(self, root_key: str, sub_key_path: str) -> Tuple[str, str]:
+        """Create a key and any missing parent keys, like RegCreateKeyEx."""
+        parts = sub_key_path.split('\\') if sub_key_path else []
+        for depth in range(1, len(parts) + 1):
+            path = '\\'.join(parts[:depth])
+            key_id = self.key_id(root_key, path)
+            if key_id not in self._keys:
+                self._keys[key_id] = {}
+                self._key_names[key_id] = path
+                self._touch(key_id)
+        return self.key_id(root_key, sub_key_path)
+
+    def _touch(self, key_id: Tuple[str, str]) -> None:
+        """Advance the logical clock for a modified key."""
+        self._clock += 1
+        self._timestamps[key_id] = self._clock
+        self._notify(key_id)
+
+    def _notify(self, key_id: Tuple[str, str]) -> None:
+        """Forward a key change to all notifiers."""
+        for notifier in self._notifiers:
+            notifier.notify(key_id)
 
 def format_registry_value_by_type(value, reg_type: int) -> str:
     """Format registry value based on its type."""
@@ -302,36 +842,46 @@ def format_registry_value_by_type(value, reg_type: int) -> str:
         return formatter(value)
     return f'{value} (Type: {reg_type})'
 
-def query_registry_value(registry_key: RegistryKey, log_callback: Callable[[str], None]) -> Tuple[str, str]:
-    """Query a single registry value."""
-    if not is_windows_system():
-        return "N/A (Not on Windows)", SystemStatus.NOT_WINDOWS.value
-    
-    root_key = get_registry_root_key(registry_key.root_key)
-    if not root_key:
-        log_callback(f"Warning: Unknown root key: {registry_key.root_key}")
-        return f"Unknown root key: {registry_key.root_key}", SystemStatus.ERROR.value
-    
-    try:
-        with winreg.OpenKey(root_key, registry_key.sub_key_path, 0, winreg.KEY_READ) as key_handle:
-            value, reg_type = winreg.QueryValueEx(key_handle, registry_key.value_name)
-            formatted_value = format_registry_value_by_type(value, reg_type)
-            return formatted_value, SystemStatus.FOUND.value
-    except FileNotFoundError:
-        return f"{STATUS_NOT_FOUND} KEY/VALUE NOT FOUND", SystemStatus.NOT_FOUND.value
-    except Exception as e:
-        error_msg = f"Error querying value {registry_key.value_name}: {e}"
-        log_callback(error_msg)
-        return f"{STATUS_ERROR} ERROR: {e}", SystemStatus.ERROR.value
-
-def get_current_registry_value(full_key_path: str, log_callback: Callable[[str], None]) -> Tuple[str, str]:
-    """Get current registry value for a given path."""
-    try:
-        registry_key = parse_registry_key_path(full_key_path)
-        return query_registry_value(registry_key, log_callback)
-    except Exception as e:
-        log_callback(f"Error processing key path {full_key_path}: {e}")
-        return f"{STATUS_ERROR} ERROR: {e}", SystemStatus.ERROR.value
+def decode_registry_bytes(data: bytes, reg_type: int):
+    """Convert raw hex(...) bytes from a .reg file into the value winreg expects."""
+    if reg_type == winreg.REG_EXPAND_SZ or reg_type == winreg.REG_SZ:
+        text = data.decode('utf-16-le')
+        return text[:-1] if text.endswith('\x00') else text
+    if reg_type == winreg.REG_MULTI_SZ:
+        strings = data.decode('utf-16-le').split('\x00')
+        while strings and not strings[-1]:
+            strings.pop()
+        return strings
+    if reg_type == winreg.REG_DWORD or reg_type == winreg.REG_QWORD:
+        return int.from_bytes(data, 'little')
+    return data
+
+def parse_registry_value(raw_value: str) -> Optional[Tuple[Any, int]]:
+    """Parse a .reg value string into a value and type; returns None for a deletion."""
+    if raw_value == REG_DELETE_VALUE:
+        return None
+    if len(raw_value) >= 2 and raw_value.startswith('"') and raw_value.endswith('"'):
+        return re.sub(r'\\(.)', r'\1', raw_value[1:-1]), winreg.REG_SZ
+
+    prefix, separator, data = raw_value.partition(':')
+    prefix = prefix.strip().lower()
+    if separator and prefix == 'dword':
+        return int(data, 16), winreg.REG_DWORD
+    if separator and prefix == 'hex':
+        reg_type = winreg.REG_BINARY
+    elif separator and prefix.startswith('hex(') and prefix.endswith(')'):
+        reg_type = int(prefix[4:-1], 16)
+    else:
+        raise ValueError(f"Unsupported registry value: {raw_value}")
+
+    data = data.strip()
+    if reg_type == winreg.REG_QWORD and data and ',' not in data:
+        return int(data, 16), reg_type
+    return decode_registry_bytes(bytes.fromhex(data.replace(',', ' ')), reg_type), reg_type
+
+def parse_registry_value_name(key_name: str) -> str:
+    """Convert a .reg value name into a winreg value name."""
+    return "" if key_name == REG_DEFAULT_VALUE_NAME else key_name
 
 def create_comparison_displays(file_value: str, system_value: str, status: ComparisonStatus) -> Tuple[str, str]:
     """Create display strings for comparison results."""
@@ -363,53 +913,694 @@ def compare_values(file_value: str, system_value: str, system_status: str) -> Tu
     file_display, system_display = create_comparison_displays(file_value, system_value, comparison_status)
     return comparison_status.value, file_display, system_display
 
-def create_backup_entry(value_name: str, value, reg_type: int) -> str:
-    """Create a backup registry entry string."""
-    formatted_value = format_registry_value_by_type(value, reg_type)
-    return f'"{value_name}"={formatted_value}\r\n'
+def build_comparison_result(path: str, key_name: str, file_value: str,
+                            system_value: str, system_status: str) -> ComparisonResult:
+    """Build a comparison result for a single value."""
+    match_status, file_display, system_display = compare_values(file_value, system_value, system_status)
+    return ComparisonResult(
+        path=path,
+        key_name=key_name,
+        file_value=file_value,
+        system_value=system_value,
+        file_display=file_display,
+        system_display=system_display,
+        match_status=match_status,
+        system_status=system_status
+    )
 
-def get_backup_registry_value(registry_key: RegistryKey, log_callback: Callable[[str], None]) -> Optional[str]:
-    """Get registry value for backup purposes."""
-    if not is_windows_system():
-        return None
+@dataclass
+class KeyReadGroup:
+    root_key_str: str
+    root_key: Any
+    sub_key_path: str
+    paths: List[str]
+    value_names: List[str]
+
+@dataclass
+class ReadPlan:
+    groups: List[KeyReadGroup]
+    requested_reads: int
+
+    @property
+    def unique_reads(self) -> int:
+        """Count the value reads left after de-duplication."""
+        return sum(len(group.value_names) for group in self.groups)
+
+    def describe(self) -> str:
+        """Summarize the cost of the plan."""
+        hives = len({group.root_key_str.upper() for group in self.groups})
+        duplicates = self.requested_reads - self.unique_reads
+        return (f"Read plan: {self.unique_reads} value reads in {len(self.groups)} keys across {hives} hives "
+                f"({duplicates} duplicate reads removed, {len(self.groups)} key opens instead of "
+                f"{self.requested_reads}).")
+
+def planned_read_id(path: str, value_name: str) -> Tuple[str, str]:
+    """Get the case-insensitive identity of a value read."""
+    return registry_path_key(path), value_name.casefold()
+
+def plan_registry_reads(parsed_settings: Dict[str, Dict[str, str]], backend) -> ReadPlan:
+    """Group value reads by key, drop duplicates and order them by hive and key path."""
+    roots: Dict[str, Any] = {}
+    groups: Dict[str, KeyReadGroup] = {}
+    planned: Set[Tuple[str, str]] = set()
+    requested_reads = 0
+    for path, keys in parsed_settings.items():
+        root_key_str, sub_key_path = split_registry_key_path(path)
+        if root_key_str not in roots:
+            roots[root_key_str] = backend.resolve_root(root_key_str)
+        group_key = registry_path_key(path)
+        group = groups.get(group_key)
+        if group is None:
+            group = groups[group_key] = KeyReadGroup(root_key_str, roots[root_key_str], sub_key_path, [], [])
+        group.paths.append(path)
+        for key_name in keys:
+            requested_reads += 1
+            value_name = parse_registry_value_name(key_name)
+            read_id = (group_key, value_name.casefold())
+            if read_id not in planned:
+                planned.add(read_id)
+                group.value_names.append(value_name)
+
+    ordered = sorted(groups.values(), key=lambda group: (group.root_key_str.upper(), group.sub_key_path.casefold()))
+    return ReadPlan(ordered, requested_reads)
+
+def execute_read_plan(plan: ReadPlan, backend, log_callback: Callable[[str], None]):
+    """Run a read plan one key at a time, opening each key once.
     
-    root_key = get_registry_root_key(registry_key.root_key)
-    if not root_key:
-        log_callback(f"Warning: Unknown root key: {registry_key.root_key}")
-        return None
+    Yields each group with its reads as (value and type, system status, error text), keyed by folded value name.
+    """
+    for group in plan.groups:
+        if group.root_key is None:
+            log_callback(f"Warning: Unknown root key: {group.root_key_str}")
+            failure = (None, SystemStatus.ERROR.value, f"Unknown root key: {group.root_key_str}")
+            yield group, {name.casefold(): failure for name in group.value_names}
+            continue
+        
+        try:
+            key_handle = backend.open_key(group.root_key, group.sub_key_path)
+        except FileNotFoundError:
+            missing = (None, SystemStatus.NOT_FOUND.value, "")
+            yield group, {name.casefold(): missing for name in group.value_names}
+            continue
+        except Exception as e:
+            log_callback(f"Error opening key {group.paths[0]}: {e}")
+            failure = (None, SystemStatus.ERROR.value, f"{STATUS_ERROR} ERROR: {e}")
+            yield group, {name.casefold(): failure for name in group.value_names}
+            continue
+        
+        reads = {}
+        try:
+            for value_name in group.value_names:
+                try:
+                    current = tuple(backend.query_value(key_handle, value_name))
+                    reads[value_name.casefold()] = (current, SystemStatus.FOUND.value, "")
+                except FileNotFoundError:
+                    reads[value_name.casefold()] = (None, SystemStatus.NOT_FOUND.value, "")
+                except Exception as e:
+                    log_callback(f"Error querying value {value_name}: {e}")
+                    reads[value_name.casefold()] = (None, SystemStatus.ERROR.value, f"{STATUS_ERROR} ERROR: {e}")
+        finally:
+            backend.close_key(key_handle)
+        yield group, reads
+
+def iter_registry_reads(parsed_settings: Dict[str, Dict[str, str]], log_callback: Callable[[str], None],
+                        backend=None):
+    """Plan the reads for a parsed .reg file, log the plan cost, then yield the reads key by key."""
+    not_windows = backend is None and not is_windows_system()
+    backend = backend if backend is not None else WinregBackend()
+    plan = plan_registry_reads(parsed_settings, backend)
+    log_callback(plan.describe())
     
+    if not_windows:
+        read = (None, SystemStatus.NOT_WINDOWS.value, "N/A (Not on Windows)")
+        for group in plan.groups:
+            yield group, {name.casefold(): read for name in group.value_names}
+        return
+    yield from execute_read_plan(plan, backend, log_callback)
+
+def read_registry_values(parsed_settings: Dict[str, Dict[str, str]], log_callback: Callable[[str], None],
+                         backend=None) -> Dict[Tuple[str, str], Tuple[Optional[Tuple[Any, int]], str, str]]:
+    """Read every value of a parsed .reg file through a read plan, keyed by planned_read_id."""
+    reads = {}
+    for group, group_reads in iter_registry_reads(parsed_settings, log_callback, backend):
+        for path in group.paths:
+            path_key = registry_path_key(path)
+            reads.update(((path_key, name), read) for name, read in group_reads.items())
+    return reads
+
+def format_planned_read(read: Tuple[Optional[Tuple[Any, int]], str, str]) -> Tuple[str, str]:
+    """Turn an executed read into the display value and system status used for comparison."""
+    current, system_status, error_text = read
+    if system_status == SystemStatus.FOUND.value:
+        return format_registry_value_by_type(*current), system_status
+    if system_status == SystemStatus.NOT_FOUND.value:
+        return f"{STATUS_NOT_FOUND} KEY/VALUE NOT FOUND", system_status
+    return error_text, system_status
+
+def update_comparison_stats(stats: Dict[str, int], match_status: str) -> None:
+    """Update comparison statistics."""
+    stats["total"] += 1
+    if match_status == ComparisonStatus.MATCH.value:
+        stats["matches"] += 1
+    elif match_status == ComparisonStatus.DIFFERENT.value:
+        stats["differences"] += 1
+    elif match_status == ComparisonStatus.MISSING.value:
+        stats["missing"] += 1
+    elif match_status == ComparisonStatus.ERROR.value:
+        stats["errors"] += 1
+
+def summarize_comparison_results(results) -> Dict[str, int]:
+    """Count comparison results by status."""
+    stats = {"total": 0, "matches": 0, "differences": 0, "missing": 0, "errors": 0}
+    for result in results:
+        update_comparison_stats(stats, result.match_status)
+    return stats
+
+class InMemoryResultStore:
+    """Keeps comparison results in a list; suitable for ordinary .reg files."""
+
+    def __init__(self):
+        self._results: List[ComparisonResult] = []
+        self._results_by_path: Dict[str, List[ComparisonResult]] = {}
+
+    def add(self, result: ComparisonResult) -> None:
+        """Append a result."""
+        self._results.append(result)
+        self._results_by_path.setdefault(result.path, []).append(result)
+
+    def flush(self) -> None:
+        """Make every added result visible to queries."""
+
+    def count(self, match_status: Optional[str] = None) -> int:
+        """Count results, optionally only those with a given status."""
+        if match_status is None:
+            return len(self._results)
+        return sum(1 for result in self._results if result.match_status == match_status)
+
+    def page(self, match_status: Optional[str], offset: int, limit: int) -> List[ComparisonResult]:
+        """Get one page of results in comparison order, optionally filtered by status."""
+        results = self._results if match_status is None else (
+            result for result in self._results if result.match_status == match_status
+        )
+        return list(islice(results, offset, offset + limit))
+
+    def for_path(self, path: str) -> List[ComparisonResult]:
+        """Get every result of one section in comparison order."""
+        return list(self._results_by_path.get(path, ()))
+
+    def search_values(self, text: str, limit: int) -> Tuple[List[ComparisonResult], int]:
+        """Find up to limit results whose value name contains the text case-insensitively, and the total count."""
+        needle = text.casefold()
+        matches = [result for result in self._results if needle in result.key_name.casefold()]
+        return matches[:limit], len(matches)
+
+    def close(self) -> None:
+        """Release the stored results."""
+        self._results = []
+        self._results_by_path = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __iter__(self):
+        return iter(self._results)
+
+class SqliteResultStore:
+    """Streams comparison results into a temporary SQLite database so memory stays bounded."""
+
+    COLUMNS = ("path", "key_name", "file_value", "system_value",
+               "file_display", "system_display", "match_status", "system_status")
+
+    def __init__(self, database_path: Optional[str] = None, batch_size: int = RESULT_STORE_BATCH_SIZE):
+        if database_path is None:
+            file_descriptor, database_path = tempfile.mkstemp(prefix="regutility_results_", suffix=".sqlite3")
+            os.close(file_descriptor)
+            self._owns_file = True
+        else:
+            self._owns_file = False
+        self.database_path = database_path
+        self.batch_size = batch_size
+        self._pending: List[Tuple[str, ...]] = []
+        self._count = 0
+        self._connection = sqlite3.connect(database_path)
+        self._connection.execute("PRAGMA journal_mode = OFF")
+        self._connection.execute("PRAGMA synchronous = OFF")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY, {', '.join(self.COLUMNS)}, name_key)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_status ON results (match_status, id)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_path ON results (path, id)")
+        self._count = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def add(self, result: ComparisonResult) -> None:
+        """Queue a result, writing a batch once enough have accumulated."""
+        self._pending.append((*(getattr(result, column) for column in self.COLUMNS), result.key_name.casefold()))
+        self._count += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued results."""
+        if not self._pending:
+            return
+        placeholders = ", ".join("?" for _ in range(len(self.COLUMNS) + 1))
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO results ({', '.join(self.COLUMNS)}, name_key) VALUES ({placeholders})", self._pending
+            )
+        self._pending = []
+
+    def count(self, match_status: Optional[str] = None) -> int:
+        """Count results, optionally only those with a given status."""
+        if match_status is None:
+            return self._count
+        self.flush()
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM results WHERE match_status = ?", (match_status,)
+        ).fetchone()[0]
+
+    def page(self, match_status: Optional[str], offset: int, limit: int) -> List[ComparisonResult]:
+        """Get one page of results in comparison order, optionally filtered by status."""
+        self.flush()
+        columns = ", ".join(self.COLUMNS)
+        if match_status is None:
+            rows = self._connection.execute(
+                f"SELECT {columns} FROM results ORDER BY id LIMIT ? OFFSET ?", (limit, offset)
+            )
+        else:
+            rows = self._connection.execute(
+                f"SELECT {columns} FROM results WHERE match_status = ? ORDER BY id LIMIT ? OFFSET ?",
+                (match_status, limit, offset)
+            )
+        return [ComparisonResult(*row) for row in rows]
+
+    def for_path(self, path: str) -> List[ComparisonResult]:
+        """Get every result of one section in comparison order."""
+        self.flush()
+        rows = self._connection.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM results WHERE path = ? ORDER BY id", (path,)
+        )
+        return [ComparisonResult(*row) for row in rows]
+
+    def search_values(self, text: str, limit: int) -> Tuple[List[ComparisonResult], int]:
+        """Find up to limit results whose value name contains the text case-insensitively, and the total count."""
+        self.flush()
+        needle = text.casefold()
+        total = self._connection.execute(
+            "SELECT COUNT(*) FROM results WHERE instr(name_key, ?) > 0", (needle,)
+        ).fetchone()[0]
+        rows = self._connection.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM results WHERE instr(name_key, ?) > 0 ORDER BY id LIMIT ?",
+            (needle, limit)
+        )
+        return [ComparisonResult(*row) for row in rows], total
+
+    def close(self) -> None:
+        """Close the database and delete it if it was a temporary file."""
+        self._pending = []
+        self._connection.close()
+        if self._owns_file:
+            try:
+                os.remove(self.database_path)
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        self.flush()
+        query = f"SELECT id, {', '.join(self.COLUMNS)} FROM results WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            rows = self._connection.execute(query, (last_id, self.batch_size)).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                yield ComparisonResult(*row[1:])
+            last_id = rows[-1][0]
+
+class ResultPathIndex:
+    """Prefix index over the section paths of comparison results, with substring search over the paths."""
+
+    def __init__(self):
+        self._display_paths: Dict[str, str] = {}
+        self._children: Dict[str, Dict[str, str]] = {}
+        self._sections: Dict[str, str] = {}
+        self._last_path = None
+
+    def add(self, result: ComparisonResult) -> None:
+        """Index the section path of a result."""
+        if result.path != self._last_path:
+            self._last_path = result.path
+            section_key = registry_path_key(result.path)
+            if section_key not in self._sections:
+                self._add_section(section_key, result.path)
+
+    def children(self, node_path: str = "") -> List[Tuple[str, str]]:
+        """List the (name, path) of the direct children of a node, sorted case-insensitively."""
+        child_keys = self._children.get(registry_path_key(node_path), {})
+        return sorted(((name, self._display_paths[child_key]) for child_key, name in child_keys.items()),
+                      key=lambda child: child[0].casefold())
+
+    def has_children(self, node_path: str) -> bool:
+        """Check whether a node has child keys."""
+        return bool(self._children.get(registry_path_key(node_path)))
+
+    def is_section(self, node_path: str) -> bool:
+        """Check whether a node is a section with compared values."""
+        return registry_path_key(node_path) in self._sections
+
+    def section_path(self, node_path: str) -> Optional[str]:
+        """Get the path of a node as spelled by its section's results, or None if it has no values."""
+        return self._sections.get(registry_path_key(node_path))
+
+    def search(self, text: str, limit: int) -> Tuple[List[str], int]:
+        """Find up to limit section paths containing the text case-insensitively, and the total count."""
+        needle = text.casefold()
+        matches = [path for section_key, path in self._sections.items() if needle in section_key]
+        return matches[:limit], len(matches)
+
+    def _add_section(self, section_key: str, path: str) -> None:
+        """Register a section and every ancestor node of its path."""
+        self._sections[section_key] = path
+        parent_key = ""
+        segments = path.split('\\')
+        for depth in range(1, len(segments) + 1):
+            node_path = '\\'.join(segments[:depth])
+            node_key = registry_path_key(node_path)
+            self._display_paths.setdefault(node_key, node_path)
+            self._children.setdefault(parent_key, {}).setdefault(node_key, segments[depth - 1])
+            parent_key = node_key
+
+def create_result_store(value_count: int):
+    """Pick an in-memory or disk-backed result store for the expected number of values."""
+    if value_count > RESULT_STORE_DISK_THRESHOLD:
+        return SqliteResultStore()
+    return InMemoryResultStore()
+
+@dataclass
+class HistoryRun:
+    run_id: int
+    started_at: float
+    source_file: str
+    total: int
+    matches: int
+    differences: int
+    missing: int
+    errors: int
+    changed: int
+
+@dataclass
+class StatusChange:
+    run_id: int
+    started_at: float
+    match_status: str
+
+@dataclass
+class DriftingValue:
+    path: str
+    key_name: str
+    match_status: str
+    since: StatusChange
+
+def default_history_path() -> str:
+    """Get the per-user path of the comparison history database."""
+    return os.path.join(default_app_data_dir(), HISTORY_DATABASE_NAME)
+
+def history_source_key(source_file: str) -> str:
+    """Get the identity under which runs of a .reg file are grouped."""
+    return os.path.normcase(os.path.abspath(source_file))
+
+class HistoryStore:
+    """Append-only SQLite history of comparison runs that stores only status changes between runs."""
+
+    RUN_COLUMNS = ("id", "started_at", "source_file", "total", "matches", "differences", "missing", "errors", "changed")
+    DRIFT_RESET_STATUSES = (ComparisonStatus.MATCH.value, HISTORY_NOT_COMPARED)
+
+    def __init__(self, database_path: Optional[str] = None, batch_size: int = HISTORY_BATCH_SIZE):
+        self.database_path = database_path or default_history_path()
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(os.path.abspath(self.database_path)), exist_ok=True)
+        self._connection = sqlite3.connect(self.database_path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        with self._connection:
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS sources (
+                    id INTEGER PRIMARY KEY, source_key TEXT NOT NULL UNIQUE, source_file TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY, source_id INTEGER NOT NULL, started_at REAL NOT NULL,
+                    total INTEGER, matches INTEGER, differences INTEGER, missing INTEGER, errors INTEGER,
+                    changed INTEGER);
+                CREATE INDEX IF NOT EXISTS runs_source ON runs (source_id, id);
+                CREATE TABLE IF NOT EXISTS tracked_values (
+                    id INTEGER PRIMARY KEY, source_id INTEGER NOT NULL, path_key TEXT NOT NULL,
+                    name_key TEXT NOT NULL, path TEXT NOT NULL, key_name TEXT NOT NULL, last_status TEXT,
+                    UNIQUE (source_id, path_key, name_key));
+                CREATE TABLE IF NOT EXISTS status_changes (
+                    value_id INTEGER NOT NULL, run_id INTEGER NOT NULL, match_status TEXT NOT NULL,
+                    PRIMARY KEY (value_id, run_id)) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS status_changes_run ON status_changes (run_id);
+                CREATE TEMP TABLE IF NOT EXISTS current_run (
+                    path_key TEXT NOT NULL, name_key TEXT NOT NULL, path TEXT NOT NULL, key_name TEXT NOT NULL,
+                    match_status TEXT NOT NULL, PRIMARY KEY (path_key, name_key)) WITHOUT ROWID;
+            """)
+
+    def record_run(self, source_file: str, results, started_at: Optional[float] = None,
+                   progress_callback: Optional[Callable[[], None]] = None) -> HistoryRun:
+        """Append a comparison run, storing only the statuses that changed since the previous run of the file.
+        
+        progress_callback, if given, is called after every staged batch and periodically during the SQL diff.
+        """
+        if progress_callback is None:
+            return self._record_run(source_file, results, started_at, lambda: None)
+        self._connection.set_progress_handler(lambda: progress_callback() or 0, HISTORY_PROGRESS_STEPS)
+        try:
+            return self._record_run(source_file, results, started_at, progress_callback)
+        finally:
+            self._connection.set_progress_handler(None, 0)
+
+    def _record_run(self, source_file: str, results, started_at: Optional[float],
+                    progress_callback: Callable[[], None]) -> HistoryRun:
+        """Append a comparison run inside one transaction."""
+        started_at = time.time() if started_at is None else started_at
+        stats = {"total": 0, "matches": 0, "differences": 0, "missing": 0, "errors": 0}
+        with self._connection:
+            source_id = self._source_id(source_file)
+            run_id = self._connection.execute(
+                "INSERT INTO runs (source_id, started_at) VALUES (?, ?)", (source_id, started_at)
+            ).lastrowid
+            self._connection.execute("DELETE FROM temp.current_run")
+            
+            batch = []
+            for result in results:
+                update_comparison_stats(stats, result.match_status)
+                batch.append((registry_path_key(result.path), result.key_name.casefold(),
+                              result.path, result.key_name, result.match_status))
+                if len(batch) >= self.batch_size:
+                    self._stage_results(batch)
+                    batch = []
+                    progress_callback()
+            self._stage_results(batch)
+            
+            self._connection.execute("""
+                INSERT OR IGNORE INTO tracked_values (source_id, path_key, name_key, path, key_name)
+                SELECT ?, path_key, name_key, path, key_name FROM temp.current_run
+            """, (source_id,))
+            self._connection.execute("""
+                INSERT INTO status_changes (value_id, run_id, match_status)
+                SELECT v.id, ?, c.match_status FROM temp.current_run c
+                JOIN tracked_values v ON v.source_id = ? AND v.path_key = c.path_key AND v.name_key = c.name_key
+                WHERE v.last_status IS NOT c.match_status
+            """, (run_id, source_id))
+            self._connection.execute("""
+                INSERT INTO status_changes (value_id, run_id, match_status)
+                SELECT v.id, ?, ? FROM tracked_values v
+                WHERE v.source_id = ? AND v.last_status IS NOT NULL AND v.last_status != ?
+                  AND NOT EXISTS (SELECT 1 FROM temp.current_run c
+                                  WHERE c.path_key = v.path_key AND c.name_key = v.name_key)
+            """, (run_id, HISTORY_NOT_COMPARED, source_id, HISTORY_NOT_COMPARED))
+            self._connection.execute("""
+                UPDATE tracked_values SET last_status = (
+                    SELECT match_status FROM status_changes s WHERE s.value_id = tracked_values.id AND s.run_id = ?)
+                WHERE id IN (SELECT value_id FROM status_changes WHERE run_id = ?)
+            """, (run_id, run_id))
+            changed = self._connection.execute(
+                "SELECT COUNT(*) FROM status_changes WHERE run_id = ?", (run_id,)
+            ).fetchone()[0]
+            self._connection.execute(
+                "UPDATE runs SET total = ?, matches = ?, differences = ?, missing = ?, errors = ?, changed = ? "
+                "WHERE id = ?",
+                (stats["total"], stats["matches"], stats["differences"], stats["missing"], stats["errors"],
+                 changed, run_id)
+            )
+            self._connection.execute("DELETE FROM temp.current_run")
+        return HistoryRun(run_id, started_at, source_file, stats["total"], stats["matches"], stats["differences"],
+                          stats["missing"], stats["errors"], changed)
+
+    def runs(self, source_file: Optional[str] = None, limit: Optional[int] = None) -> List[HistoryRun]:
+        """Get run summaries in run order, optionally for one .reg file and only the most recent ones."""
+        query = ("SELECT runs.id, runs.started_at, sources.source_file, total, matches, differences, missing, "
+                 "errors, changed FROM runs JOIN sources ON sources.id = runs.source_id")
+        parameters: List[Any] = []
+        if source_file is not None:
+            query += " WHERE sources.source_key = ?"
+            parameters.append(history_source_key(source_file))
+        query += " ORDER BY runs.id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        rows = self._connection.execute(query, parameters).fetchall()
+        return [HistoryRun(*row) for row in reversed(rows)]
+
+    def timeline(self, source_file: str, path: str, key_name: str) -> List[StatusChange]:
+        """Get the status changes of one value, oldest first."""
+        rows = self._connection.execute("""
+            SELECT s.run_id, r.started_at, s.match_status FROM status_changes s
+            JOIN runs r ON r.id = s.run_id
+            WHERE s.value_id = (SELECT v.id FROM tracked_values v JOIN sources ON sources.id = v.source_id
+                                WHERE sources.source_key = ? AND v.path_key = ? AND v.name_key = ?)
+            ORDER BY s.run_id
+        """, (history_source_key(source_file), registry_path_key(path), key_name.casefold()))
+        return [StatusChange(*row) for row in rows]
+
+    def drifting_since(self, source_file: str, path: str, key_name: str) -> Optional[StatusChange]:
+        """Get the run in which a value stopped matching, or None if it currently matches."""
+        since = None
+        for change in reversed(self.timeline(source_file, path, key_name)):
+            if change.match_status in self.DRIFT_RESET_STATUSES:
+                break
+            since = change
+        return since
+
+    def drifting_values(self, source_file: str, limit: Optional[int] = None) -> List[DriftingValue]:
+        """Get the values of a .reg file that do not match now, with the run in which they started drifting."""
+        reset_placeholders = ", ".join("?" for _ in self.DRIFT_RESET_STATUSES)
+        rows = self._connection.execute(f"""
+            SELECT d.path, d.key_name, d.last_status, d.run_id, r.started_at, s.match_status FROM (
+                SELECT v.id, v.path_key, v.name_key, v.path, v.key_name, v.last_status, MIN(c.run_id) AS run_id
+                FROM tracked_values v
+                JOIN sources ON sources.id = v.source_id
+                JOIN status_changes c ON c.value_id = v.id
+                WHERE sources.source_key = ? AND v.last_status NOT IN ({reset_placeholders})
+                  AND c.run_id > COALESCE((SELECT MAX(m.run_id) FROM status_changes m WHERE m.value_id = v.id
+                                           AND m.match_status IN ({reset_placeholders})), 0)
+                GROUP BY v.id) d
+            JOIN status_changes s ON s.value_id = d.id AND s.run_id = d.run_id
+            JOIN runs r ON r.id = d.run_id
+            ORDER BY d.path_key, d.name_key
+            LIMIT ?
+        """, (history_source_key(source_file), *self.DRIFT_RESET_STATUSES, *self.DRIFT_RESET_STATUSES,
+              -1 if limit is None else limit))
+        return [DriftingValue(path, key_name, match_status, StatusChange(run_id, started_at, change_status))
+                for path, key_name, match_status, run_id, started_at, change_status in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
+
+    def _source_id(self, source_file: str) -> int:
+        """Get or create the row that groups the runs of a .reg file."""
+        source_key = history_source_key(source_file)
+        self._connection.execute(
+            "INSERT OR IGNORE INTO sources (source_key, source_file) VALUES (?, ?)", (source_key, source_file)
+        )
+        return self._connection.execute("SELECT id FROM sources WHERE source_key = ?", (source_key,)).fetchone()[0]
+
+    def _stage_results(self, batch: List[Tuple[str, ...]]) -> None:
+        """Write a batch of this run's statuses to the staging table."""
+        if batch:
+            self._connection.executemany("INSERT OR REPLACE INTO temp.current_run VALUES (?, ?, ?, ?, ?)", batch)
+
+def format_history_time(timestamp: float) -> str:
+    """Format a run timestamp in local time."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+def format_history_report(runs: List[HistoryRun], drifting: List[DriftingValue]) -> List[str]:
+    """Format run summaries and currently drifting values as text lines."""
+    lines = []
+    for run in runs:
+        lines.append(f"Run {run.run_id} at {format_history_time(run.started_at)}: {run.total} total, "
+                     f"{run.matches} matches, {run.differences} differences, {run.missing} missing, "
+                     f"{run.errors} errors ({run.changed} changed)")
+    for value in drifting:
+        lines.append(f'[{value.path}] "{value.key_name}": {value.match_status} since run {value.since.run_id} '
+                     f"at {format_history_time(value.since.started_at)}")
+    return lines
+
+def run_history_report(reg_file_path: str) -> None:
+    """Print the recent comparison runs of a .reg file and the values that currently drift from it."""
     try:
-        with winreg.OpenKey(root_key, registry_key.sub_key_path, 0, winreg.KEY_READ) as key_handle:
-            value, reg_type = winreg.QueryValueEx(key_handle, registry_key.value_name)
-            return create_backup_entry(registry_key.value_name, value, reg_type)
-    except FileNotFoundError:
-        return None
-    except Exception as e:
-        log_callback(f"Error querying value {registry_key.value_name}: {e}")
-        return None
+        history = HistoryStore()
+    except (sqlite3.Error, OSError) as e:
+        print(f"{STATUS_ERROR} ERROR: Could not open the comparison history: {e}")
+        sys.exit(1)
+    try:
+        runs = history.runs(reg_file_path, limit=HISTORY_REPORT_RUNS)
+        if not runs:
+            print(f"No comparison history for {reg_file_path}.")
+            return
+        for line in format_history_report(runs, history.drifting_values(reg_file_path)):
+            print(line)
+    finally:
+        history.close()
+
+def format_reg_file_value_name(value_name: str) -> str:
+    """Format a value name as written in a .reg file, using @ for the default value."""
+    return REG_DEFAULT_VALUE_NAME if value_name == REG_DEFAULT_VALUE_NAME else f'"{value_name}"'
+
+def create_backup_entry(value_name: str, value, reg_type: int) -> str:
+    """Create a backup registry entry string."""
+    formatted_value = format_registry_value_by_type(value, reg_type)
+    return f'{format_reg_file_value_name(value_name)}={formatted_value}\r\n'
 
 def get_current_registry_values_for_backup(parsed_settings: Dict[str, Dict[str, str]], 
-                                         log_callback: Callable[[str], None]) -> Dict[str, str]:
+                                         log_callback: Callable[[str], None], backend=None) -> Dict[str, str]:
     """Get current registry values for backup creation."""
     current_values = {}
     
-    if not is_windows_system():
+    if backend is None and not is_windows_system():
         log_callback("Warning: Not running on Windows. Backup will only contain deletion entries.")
         return {}
     
+    reads = read_registry_values(parsed_settings, log_callback, backend)
     for path, keys in parsed_settings.items():
         for key_name in keys.keys():
-            full_key_path = f'{path}\\{key_name}'
-            try:
-                registry_key = parse_registry_key_path(full_key_path)
-                backup_entry = get_backup_registry_value(registry_key, log_callback)
-                if backup_entry:
-                    current_values[full_key_path] = backup_entry
-            except Exception as e:
-                log_callback(f"Error processing key path {full_key_path}: {e}")
+            current = reads[planned_read_id(path, parse_registry_value_name(key_name))][0]
+            if current is not None:
+                current_values[f'{path}\\{key_name}'] = create_backup_entry(key_name, *current)
     
     return current_values
 
+def get_minimal_backup_values(parsed_settings: Dict[str, Dict[str, str]],
+                              log_callback: Callable[[str], None],
+                              backend=None) -> Tuple[Dict[str, Dict[str, str]], Dict[str, str]]:
+    """Keep only the values the .reg file would change or create, with their current backup entries."""
+    if backend is None and not is_windows_system():
+        log_callback("Warning: Not running on Windows. Minimal backup is not possible; all values are included.")
+        return parsed_settings, {}
+    
+    changed_settings = {}
+    current_values = {}
+    reads = read_registry_values(parsed_settings, log_callback, backend)
+    for path, keys in parsed_settings.items():
+        for key_name, file_value in keys.items():
+            read = reads[planned_read_id(path, parse_registry_value_name(key_name))]
+            current = read[0]
+            system_value, system_status = format_planned_read(read)
+            status = determine_comparison_status(file_value, system_value, system_status)
+            if status == ComparisonStatus.MATCH:
+                continue
+            if status == ComparisonStatus.MISSING and file_value == REG_DELETE_VALUE:
+                continue
+            
+            changed_settings.setdefault(path, {})[key_name] = file_value
+            if current is not None:
+                current_values[f'{path}\\{key_name}'] = create_backup_entry(key_name, *current)
+    
+    return changed_settings, current_values
+
 def write_backup_file(parsed_settings: Dict[str, Dict[str, str]], 
                      current_values: Dict[str, str], 
                      output_file_path: str) -> None:
@@ -424,7 +1615,7 @@ def write_backup_file(parsed_settings: Dict[str, Dict[str, str]],
                 if full_key_path in current_values:
                     file.write(current_values[full_key_path])
                 else:
-                    file.write(f'"{key_name}"=-\r\n')
+                    file.write(f'{format_reg_file_value_name(key_name)}=-\r\n')
             file.write('\r\n')
 
 def generate_backup_reg(parsed_settings: Dict[str, Dict[str, str]], 
@@ -433,6 +1624,428 @@ def generate_backup_reg(parsed_settings: Dict[str, Dict[str, str]],
     """Generate backup registry file."""
     write_backup_file(parsed_settings, current_values, output_file_path)
 
+@dataclass
+class DriftEvent:
+    path: str
+    key_name: str
+    previous_status: Optional[str]
+    result: ComparisonResult
+
+class DriftMonitor:
+    """Keeps a parsed baseline in memory and rescans only keys that changed."""
+
+    def __init__(self, baseline: Dict[str, Dict[str, str]], backend=None,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        self.baseline = baseline
+        self.backend = backend if backend is not None else WinregBackend()
+        self.log_callback = log_callback or (lambda message: None)
+        self.results: Dict[Tuple[str, str], ComparisonResult] = {}
+        self._notifier = None
+        self._polled_keys: Dict[str, Optional[int]] = {}
+
+    def start(self) -> List[DriftEvent]:
+        """Scan the whole baseline once and start watching its keys."""
+        self._notifier = self.backend.create_change_notifier()
+        events = []
+        for path in self.baseline:
+            self._track_key(path)
+            events.extend(self._rescan_key(path))
+        return events
+
+    def tick(self) -> List[DriftEvent]:
+        """Rescan the keys that changed since the previous tick."""
+        changed = set()
+        if self._notifier is not None:
+            changed.update(self._notifier.poll())
+        for path, last_timestamp in list(self._polled_keys.items()):
+            if self._key_timestamp(path) != last_timestamp:
+                changed.add(path)
+
+        events = []
+        for path in changed:
+            self._track_key(path)
+            events.extend(self._rescan_key(path))
+        return events
+
+    def run(self, on_event: Callable[[DriftEvent], None],
+            interval: float = DRIFT_POLL_INTERVAL_SECONDS,
+            stop_event: Optional[threading.Event] = None) -> None:
+        """Emit drift events until the stop event is set."""
+        stop_event = stop_event or threading.Event()
+        try:
+            for event in self.start():
+                on_event(event)
+            while not stop_event.wait(interval):
+                for event in self.tick():
+                    on_event(event)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Release change notification resources."""
+        if self._notifier is not None:
+            self._notifier.close()
+            self._notifier = None
+
+    def _track_key(self, path: str) -> None:
+        """Watch a key through notifications, falling back to timestamp polling."""
+        root_key_str, sub_key_path = split_registry_key_path(path)
+        root_key = self.backend.resolve_root(root_key_str)
+        if root_key is None:
+            return
+        if self._notifier is not None:
+            if self._notifier.is_watching(path) or self._notifier.watch(path, root_key, sub_key_path):
+                self._polled_keys.pop(path, None)
+                return
+        self._polled_keys[path] = self.backend.key_timestamp(root_key, sub_key_path)
+
+    def _key_timestamp(self, path: str) -> Optional[int]:
+        """Get the last write time of a baseline key."""
+        root_key_str, sub_key_path = split_registry_key_path(path)
+        return self.backend.key_timestamp(self.backend.resolve_root(root_key_str), sub_key_path)
+
+    def _rescan_key(self, path: str) -> List[DriftEvent]:
+        """Re-read every baseline value under a key and report what changed."""
+        events = []
+        keys = self.baseline.get(path, {})
+        plan = plan_registry_reads({path: keys}, self.backend)
+        reads = {}
+        for _, group_reads in execute_read_plan(plan, self.backend, self.log_callback):
+            reads.update(group_reads)
+        for key_name, file_value in keys.items():
+            system_value, system_status = format_planned_read(reads[parse_registry_value_name(key_name).casefold()])
+            result = build_comparison_result(path, key_name, file_value, system_value, system_status)
+            previous = self.results.get((path, key_name))
+            self.results[(path, key_name)] = result
+            if previous is None:
+                if result.match_status != ComparisonStatus.MATCH.value:
+                    events.append(DriftEvent(path, key_name, None, result))
+            elif (previous.match_status, previous.system_value) != (result.match_status, result.system_value):
+                events.append(DriftEvent(path, key_name, previous.match_status, result))
+        return events
+
+def format_drift_event(event: DriftEvent) -> str:
+    """Format a drift event as a single log line."""
+    previous = event.previous_status or "baseline"
+    return (f'[{event.path}] "{event.key_name}": {previous} -> {event.result.match_status} '
+            f'(file: {event.result.file_value}, system: {event.result.system_value})')
+
+def run_drift_monitor(baseline_path: str, interval: float) -> None:
+    """Watch the registry for drift from a baseline .reg file until interrupted."""
+    if not is_windows_system():
+        print("Watch mode requires the Windows Registry and can only be run on a Windows OS.")
+        sys.exit(1)
+
+    baseline = ParseCache().load(baseline_path, print)
+    monitor = DriftMonitor(baseline, log_callback=print)
+    print(f"Watching {len(baseline)} key sections from {baseline_path} for drift...")
+    try:
+        monitor.run(lambda event: print(format_drift_event(event)), interval)
+    except KeyboardInterrupt:
+        pass
+
+@dataclass
+class UserComparisonMatrix:
+    sids: List[str]
+    results: Dict[str, Dict[Tuple[str, str], ComparisonResult]]
+
+    def rows(self) -> List[Tuple[str, str]]:
+        """List the (HKCU path, value name) rows shared by every SID."""
+        return list(self.results[self.sids[0]]) if self.sids else []
+
+    def cell(self, path: str, key_name: str, sid: str) -> Optional[ComparisonResult]:
+        """Get the result of one value for one SID."""
+        return self.results.get(sid, {}).get((path, key_name))
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Count results by status for every SID."""
+        return {sid: summarize_comparison_results(self.results[sid].values()) for sid in self.sids}
+
+def is_current_user_path(path: str) -> bool:
+    """Check if a key path lives under HKEY_CURRENT_USER."""
+    return split_registry_key_path(path)[0].upper() == CURRENT_USER_ROOT
+
+def rewrite_current_user_path(path: str, sid: str) -> str:
+    """Rewrite an HKEY_CURRENT_USER key path to the matching HKEY_USERS\\<SID> path."""
+    sub_key_path = split_registry_key_path(path)[1]
+    return f'{USERS_ROOT}\\{sid}\\{sub_key_path}' if sub_key_path else f'{USERS_ROOT}\\{sid}'
+
+def list_user_sids(backend=None) -> List[str]:
+    """List the SIDs of user profiles loaded under HKEY_USERS."""
+    backend = backend if backend is not None else WinregBackend()
+    names = backend.list_subkeys(backend.resolve_root(USERS_ROOT), "")
+    return [name for name in names
+            if name not in USER_HIVE_EXCLUDED_NAMES and not name.endswith(USER_HIVE_CLASSES_SUFFIX)]
+
+def compare_user_profile(sid: str, user_settings: Dict[str, Dict[str, str]], backend,
+                         log_callback: Callable[[str], None]) -> Dict[Tuple[str, str], ComparisonResult]:
+    """Compare HKCU settings against a single user's hive."""
+    profile_paths = {rewrite_current_user_path(path, sid): path for path in user_settings}
+    plan = plan_registry_reads({profile_path: user_settings[path] for profile_path, path in profile_paths.items()},
+                               backend)
+    results = {}
+    for group, reads in execute_read_plan(plan, backend, log_callback):
+        for profile_path in group.paths:
+            path = profile_paths[profile_path]
+            for key_name, file_value in user_settings[path].items():
+                system_value, system_status = format_planned_read(
+                    reads[parse_registry_value_name(key_name).casefold()]
+                )
+                results[(path, key_name)] = build_comparison_result(path, key_name, file_value,
+                                                                    system_value, system_status)
+    return results
+
+def compare_all_user_profiles(parsed_settings: Dict[str, Dict[str, str]], backend=None,
+                              log_callback: Optional[Callable[[str], None]] = None,
+                              sids: Optional[List[str]] = None,
+                              max_workers: int = MAX_PROFILE_WORKERS) -> UserComparisonMatrix:
+    """Compare the HKCU settings of a .reg file against every loaded user profile concurrently."""
+    backend = backend if backend is not None else WinregBackend()
+    log_callback = log_callback or (lambda message: None)
+    sids = sids if sids is not None else list_user_sids(backend)
+
+    user_settings = {path: keys for path, keys in parsed_settings.items() if is_current_user_path(path)}
+    value_count = sum(len(keys) for keys in user_settings.values())
+    log_callback(f"Comparing {value_count} HKEY_CURRENT_USER values across {len(sids)} profiles...")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sids) or 1))) as executor:
+        futures = {sid: executor.submit(compare_user_profile, sid, user_settings, backend, log_callback)
+                   for sid in sids}
+        results = {sid: future.result() for sid, future in futures.items()}
+    return UserComparisonMatrix(sids, results)
+
+def format_user_comparison_matrix(matrix: UserComparisonMatrix) -> List[str]:
+    """Format a per-SID result matrix as text lines, listing only values that drift for some SID."""
+    lines = []
+    for sid, stats in matrix.summary().items():
+        lines.append(f"{sid}: {stats['total']} total, {stats['matches']} matches, "
+                     f"{stats['differences']} differences, {stats['missing']} missing, {stats['errors']} errors")
+    for path, key_name in matrix.rows():
+        cells = [matrix.cell(path, key_name, sid) for sid in matrix.sids]
+        if all(cell.match_status == ComparisonStatus.MATCH.value for cell in cells):
+            continue
+        lines.append(f'[{path}] "{key_name}"')
+        for sid, cell in zip(matrix.sids, cells):
+            lines.append(f"  {sid}: {cell.match_status} {cell.system_display}")
+    return lines
+
+def run_user_profile_comparison(reg_file_path: str) -> None:
+    """Compare the HKCU settings of a .reg file against every loaded user profile and print the matrix."""
+    if not is_windows_system():
+        print("Per-user comparison requires the Windows Registry and can only be run on a Windows OS.")
+        sys.exit(1)
+
+    matrix = compare_all_user_profiles(ParseCache().load(reg_file_path, print), log_callback=print)
+    for line in format_user_comparison_matrix(matrix):
+        print(line)
+
+@dataclass
+class KeyWriteBatch:
+    path: str
+    root_key: Any
+    sub_key_path: str
+    writes: Dict[str, Optional[Tuple[Any, int]]]
+
+@dataclass
+class KeyBackup:
+    values: Dict[str, Optional[Tuple[Any, int]]]
+    created_keys: List[str] = field(default_factory=list)
+
+@dataclass
+class ApplyReport:
+    keys_written: int = 0
+    values_written: int = 0
+    values_verified: int = 0
+    rolled_back: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        """Check whether every value was written and verified."""
+        return not self.errors
+
+def registry_values_equal(expected: Optional[Tuple[Any, int]], actual: Optional[Tuple[Any, int]]) -> bool:
+    """Compare a written value with its read-back, treating empty binary data as None like winreg does."""
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    expected_value, expected_type = expected
+    actual_value, actual_type = actual
+    if expected_type != actual_type:
+        return False
+    if not expected_value and not actual_value:
+        return True
+    return expected_value == actual_value
+
+class RegistryApplyEngine:
+    """Applies parsed .reg settings one key at a time, verifying every write and rolling back on failure."""
+
+    def __init__(self, backend=None, log_callback: Optional[Callable[[str], None]] = None):
+        self.backend = backend if backend is not None else WinregBackend()
+        self.log_callback = log_callback or (lambda message: None)
+
+    def apply(self, parsed_settings: Dict[str, Dict[str, str]]) -> ApplyReport:
+        """Apply settings transactionally; any failure restores the captured backup."""
+        batches = self.plan(parsed_settings)
+        backups = [self._capture_backup(batch) for batch in batches]
+        report = ApplyReport()
+
+        for index, batch in enumerate(batches):
+            try:
+                self._write_batch(batch, report)
+            except Exception as e:
+                report.errors.append(f"Error applying [{batch.path}]: {e}")
+                self.log_callback(report.errors[-1])
+                self._rollback(batches[:index + 1], backups[:index + 1], report)
+                break
+        return report
+
+    def plan(self, parsed_settings: Dict[str, Dict[str, str]]) -> List[KeyWriteBatch]:
+        """Decode every value and group the writes by key before anything is written."""
+        batches: Dict[str, KeyWriteBatch] = {}
+        roots: Dict[str, Any] = {}
+        for path, keys in parsed_settings.items():
+            root_key_str, sub_key_path = split_registry_key_path(path)
+            if root_key_str.startswith('-'):
+                raise ValueError(f"Deleting keys is not supported: [{path}]")
+            if root_key_str not in roots:
+                roots[root_key_str] = self.backend.resolve_root(root_key_str)
+            if roots[root_key_str] is None:
+                raise ValueError(f"Unknown root key: {root_key_str}")
+
+            batch = batches.setdefault(registry_path_key(path), KeyWriteBatch(path, roots[root_key_str], sub_key_path, {}))
+            for key_name, raw_value in keys.items():
+                try:
+                    batch.writes[parse_registry_value_name(key_name)] = parse_registry_value(raw_value)
+                except ValueError as e:
+                    raise ValueError(f'Invalid value "{key_name}" in [{path}]: {e}') from e
+        return list(batches.values())
+
+    def _capture_backup(self, batch: KeyWriteBatch) -> KeyBackup:
+        """Record the current state of every value a batch will touch and the keys writing it would create."""
+        created_keys = self._missing_keys(batch.root_key, batch.sub_key_path)
+        if created_keys:
+            return KeyBackup({value_name: None for value_name in batch.writes}, created_keys)
+        key_handle = self.backend.open_key(batch.root_key, batch.sub_key_path)
+
+        values = {}
+        try:
+            for value_name in batch.writes:
+                try:
+                    values[value_name] = self.backend.query_value(key_handle, value_name)
+                except FileNotFoundError:
+                    values[value_name] = None
+        finally:
+            self.backend.close_key(key_handle)
+        return KeyBackup(values)
+
+    def _missing_keys(self, root_key, sub_key_path: str) -> List[str]:
+        """List a key and its parent keys that do not exist yet, deepest first."""
+        missing = []
+        parts = sub_key_path.split('\\') if sub_key_path else []
+        for depth in range(len(parts), 0, -1):
+            path = '\\'.join(parts[:depth])
+            try:
+                self.backend.close_key(self.backend.open_key(root_key, path))
+            except FileNotFoundError:
+                missing.append(path)
+                continue
+            except OSError:
+                pass
+            break
+        return missing
+
+    def _write_batch(self, batch: KeyWriteBatch, report: ApplyReport) -> None:
+        """Write all values of one key through a single handle, then read each one back."""
+        key_handle = self.backend.create_key(batch.root_key, batch.sub_key_path)
+        try:
+            self._write_values(key_handle, batch.writes)
+            report.keys_written += 1
+            report.values_written += len(batch.writes)
+            for value_name, expected in batch.writes.items():
+                actual = self._read_back(key_handle, value_name)
+                if not registry_values_equal(expected, actual):
+                    raise ValueError(f'Verification failed for "{value_name or REG_DEFAULT_VALUE_NAME}": '
+                                     f'expected {expected}, read back {actual}')
+                report.values_verified += 1
+        finally:
+            self.backend.close_key(key_handle)
+
+    def _write_values(self, key_handle, values: Dict[str, Optional[Tuple[Any, int]]]) -> None:
+        """Write or delete a set of values on an open key."""
+        for value_name, data in values.items():
+            if data is None:
+                try:
+                    self.backend.delete_value(key_handle, value_name)
+                except FileNotFoundError:
+                    pass
+            else:
+                self.backend.set_value(key_handle, value_name, data[0], data[1])
+
+    def _read_back(self, key_handle, value_name: str) -> Optional[Tuple[Any, int]]:
+        """Read a value back, returning None if it does not exist."""
+        try:
+            return tuple(self.backend.query_value(key_handle, value_name))
+        except FileNotFoundError:
+            return None
+
+    def _rollback(self, batches: List[KeyWriteBatch], backups: List[KeyBackup], report: ApplyReport) -> None:
+        """Restore the captured values of every key touched so far, then delete the keys the apply created."""
+        self.log_callback("Rolling back changes...")
+        report.rolled_back = True
+        created_keys: Dict[Tuple[Any, str], Tuple[Any, str, str]] = {}
+        for batch, backup in reversed(list(zip(batches, backups))):
+            root_key_str = split_registry_key_path(batch.path)[0]
+            for sub_key_path in backup.created_keys:
+                created_keys.setdefault((batch.root_key, sub_key_path.casefold()),
+                                        (batch.root_key, sub_key_path, f'{root_key_str}\\{sub_key_path}'))
+            try:
+                key_handle = self.backend.create_key(batch.root_key, batch.sub_key_path)
+                try:
+                    self._write_values(key_handle, backup.values)
+                finally:
+                    self.backend.close_key(key_handle)
+            except Exception as e:
+                report.errors.append(f"Error rolling back [{batch.path}]: {e}")
+                self.log_callback(report.errors[-1])
+
+        for root_key, sub_key_path, path in sorted(created_keys.values(), key=lambda key: key[1].count('\\'),
+                                                   reverse=True):
+            try:
+                self.backend.delete_key(root_key, sub_key_path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                report.errors.append(f"Error removing created key [{path}]: {e}")
+                self.log_callback(report.errors[-1])
+
+def format_apply_report(report: ApplyReport) -> List[str]:
+    """Format an apply report as text lines."""
+    lines = [
+        f"Keys written: {report.keys_written}",
+        f"Values written: {report.values_written}",
+        f"Values verified: {report.values_verified}",
+    ]
+    if report.rolled_back:
+        lines.append("All changes were rolled back.")
+    lines.extend(f"{STATUS_ERROR} {error}" for error in report.errors)
+    return lines
+
+def run_apply(reg_file_path: str) -> None:
+    """Apply a .reg file with verification and automatic rollback, then print the report."""
+    if not is_windows_system():
+        print("Applying .reg files requires the Windows Registry and can only be run on a Windows OS.")
+        sys.exit(1)
+
+    try:
+        report = RegistryApplyEngine(log_callback=print).apply(ParseCache().load(reg_file_path, print))
+    except (ValueError, OSError) as e:
+        print(f"{STATUS_ERROR} ERROR: {e}")
+        sys.exit(1)
+    for line in format_apply_report(report):
+        print(line)
+    if not report.success:
+        sys.exit(1)
+
 def create_title_label(text: str) -> QLabel:
     """Create a styled title label."""
     label = QLabel(text)
@@ -474,7 +2087,14 @@ class RegistryUtilityApp(QMainWindow):
         super().__init__()
         self.input_file_path_compare = None
         self.input_file_path_backup = None
-        self.comparison_results = []
+        self.comparison_results = InMemoryResultStore()
+        self.result_index = ResultPathIndex()
+        self.current_filter = "all"
+        self.current_page = 0
+        self.parse_cache = ParseCache()
+        self.history_store: Optional[HistoryStore] = None
+        self._recording_history = False
+        self._close_requested = False
         self._setup_window()
         self._setup_ui()
     
@@ -496,14 +2116,27 @@ class RegistryUtilityApp(QMainWindow):
         self.tabs.setStyleSheet("QTabWidget::pane { border: 0; } QTabBar::tab { font-size: 12pt; font-weight: bold; padding: 10px; }")
         main_layout.addWidget(self.tabs)
         
-        self._setup_compare_tab()
-        self._setup_backup_tab()
+        self._tab_builders = [self._setup_compare_tab, self._setup_backup_tab]
+        self._built_tabs = set()
+        self.tabs.addTab(QWidget(), "Compare Registry")
+        self.tabs.addTab(QWidget(), "Generate Backup")
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
         
         self.statusBar().showMessage("Credits: yuuki_0711")
     
-    def _setup_compare_tab(self) -> None:
+    def finish_setup(self) -> None:
+        """Build the visible tab once the window is on screen."""
+        self._ensure_tab_built(self.tabs.currentIndex())
+    
+    def _ensure_tab_built(self, index: int) -> None:
+        """Build a tab's contents the first time it is activated."""
+        if index < 0 or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        self._tab_builders[index](self.tabs.widget(index))
+    
+    def _setup_compare_tab(self, compare_widget: QWidget) -> None:
         """Setup the registry comparison tab."""
-        compare_widget = QWidget()
         compare_layout = QVBoxLayout(compare_widget)
         compare_layout.setSpacing(LAYOUT_SPACING)
         compare_layout.setContentsMargins(WINDOW_MARGIN, WINDOW_MARGIN, WINDOW_MARGIN, WINDOW_MARGIN)
@@ -524,15 +2157,16 @@ class RegistryUtilityApp(QMainWindow):
         filter_layout = self._create_filter_buttons_layout()
         compare_layout.addLayout(filter_layout)
         
-        comparison_layout = self._create_comparison_output_layout()
-        compare_layout.addLayout(comparison_layout)
+        self.result_views = QTabWidget()
+        self.result_views.addTab(self._create_side_by_side_view(), "Side by Side")
+        self.result_views.addTab(self._create_tree_view(), "Tree View")
+        compare_layout.addWidget(self.result_views)
         
         compare_layout.addWidget(create_log_label("Operation Log:"))
         self.log_output_compare = create_readonly_text_edit("log_output")
         compare_layout.addWidget(self.log_output_compare)
         
         self._log_compare("Ready to start. Please select a .reg file.")
-        self.tabs.addTab(compare_widget, "Compare Registry")
     
     def _create_file_selection_layout_compare(self) -> QHBoxLayout:
         """Create file selection layout for compare tab."""
@@ -568,6 +2202,61 @@ class RegistryUtilityApp(QMainWindow):
         
         return layout
     
+    def _create_paging_layout(self) -> QHBoxLayout:
+        """Create result paging controls layout."""
+        layout = QHBoxLayout()
+        
+        self.btn_previous_page = QPushButton("< Previous Page")
+        self.btn_previous_page.clicked.connect(lambda: self._change_page(-1))
+        self.btn_previous_page.setEnabled(False)
+        layout.addWidget(self.btn_previous_page)
+        
+        self.page_label = QLabel("")
+        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.page_label)
+        
+        self.btn_next_page = QPushButton("Next Page >")
+        self.btn_next_page.clicked.connect(lambda: self._change_page(1))
+        self.btn_next_page.setEnabled(False)
+        layout.addWidget(self.btn_next_page)
+        
+        return layout
+    
+    def _create_side_by_side_view(self) -> QWidget:
+        """Create the paged side-by-side result view."""
+        view = QWidget()
+        layout = QVBoxLayout(view)
+        layout.addLayout(self._create_comparison_output_layout())
+        layout.addLayout(self._create_paging_layout())
+        return view
+    
+    def _create_tree_view(self) -> QWidget:
+        """Create the hive/key tree result view with path search."""
+        view = QWidget()
+        layout = QVBoxLayout(view)
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search key paths and value names...")
+        self.search_input.setEnabled(False)
+        layout.addWidget(self.search_input)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._search_results)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        
+        self.search_status_label = create_file_selection_label()
+        self.search_status_label.setText("")
+        layout.addWidget(self.search_status_label)
+        
+        self.result_tree = QTreeWidget()
+        self.result_tree.setHeaderLabels(["Key / Value", "Status", "File Value", "System Value"])
+        self.result_tree.itemExpanded.connect(self._populate_tree_item)
+        layout.addWidget(self.result_tree)
+        
+        return view
+    
     def _create_comparison_output_layout(self) -> QHBoxLayout:
         """Create comparison output layout."""
         layout = QHBoxLayout()
@@ -586,16 +2275,16 @@ class RegistryUtilityApp(QMainWindow):
         
         return layout
     
-    def _setup_backup_tab(self) -> None:
+    def _setup_backup_tab(self, backup_widget: QWidget) -> None:
         """Setup the backup generation tab."""
-        backup_widget = QWidget()
         backup_layout = QVBoxLayout(backup_widget)
         backup_layout.setSpacing(LAYOUT_SPACING)
         backup_layout.setContentsMargins(WINDOW_MARGIN, WINDOW_MARGIN, WINDOW_MARGIN, WINDOW_MARGIN)
         
         backup_layout.addWidget(create_title_label("Registry (.reg) File Backup Generator"))
         backup_layout.addWidget(create_instructions_label(
-            "1. Select the .reg file you intend to apply.\n2. Click 'Generate Backup' to create a rollback file."
+            "1. Select the .reg file you intend to apply.\n2. Click 'Generate Backup' to create a rollback file.\n"
+            "3. Optionally click 'Apply' to write it with verification and automatic rollback."
         ))
         
         self.btn_select_file_backup = QPushButton("1. Select .reg File")
@@ -605,17 +2294,24 @@ class RegistryUtilityApp(QMainWindow):
         self.selected_file_label_backup = create_file_selection_label()
         backup_layout.addWidget(self.selected_file_label_backup)
         
+        self.chk_minimal_backup = QCheckBox("Only back up values the .reg file would change or create")
+        backup_layout.addWidget(self.chk_minimal_backup)
+        
         self.btn_generate_backup = QPushButton("2. Generate Backup")
         self.btn_generate_backup.setEnabled(False)
         self.btn_generate_backup.clicked.connect(self._generate_backup)
         backup_layout.addWidget(self.btn_generate_backup)
         
+        self.btn_apply = QPushButton("3. Apply .reg File")
+        self.btn_apply.setEnabled(False)
+        self.btn_apply.clicked.connect(self._apply_reg_file)
+        backup_layout.addWidget(self.btn_apply)
+        
         backup_layout.addWidget(create_log_label("Operation Log:"))
         self.log_output_backup = create_readonly_text_edit("log_output")
         backup_layout.addWidget(self.log_output_backup)
         
         self._log_backup("Ready to start. Please select a .reg file.")
-        self.tabs.addTab(backup_widget, "Generate Backup")
     
     def _log_compare(self, message: str) -> None:
         """Log message to compare tab."""
@@ -646,10 +2342,12 @@ class RegistryUtilityApp(QMainWindow):
             self.input_file_path_backup = file_path
             self.selected_file_label_backup.setText(f"Selected: {os.path.basename(file_path)}")
             self.btn_generate_backup.setEnabled(True)
+            self.btn_apply.setEnabled(True)
             self._log_backup(f"Input file selected: {file_path}")
         else:
             self.selected_file_label_backup.setText("File selection cancelled.")
             self.btn_generate_backup.setEnabled(False)
+            self.btn_apply.setEnabled(False)
     
     def _get_reg_file_path(self, dialog_title: str) -> Optional[str]:
         """Get registry file path from user."""
@@ -660,35 +2358,112 @@ class RegistryUtilityApp(QMainWindow):
     
     def _filter_results(self, filter_type: str) -> None:
         """Filter comparison results based on type."""
-        if not self.comparison_results:
+        if not len(self.comparison_results) or filter_type not in FILTER_MATCH_STATUSES:
             return
         
+        self.current_filter = filter_type
+        self.current_page = 0
+        self._show_results_page()
+    
+    def _change_page(self, step: int) -> None:
+        """Move to the previous or next page of results."""
+        self.current_page = max(0, min(self.current_page + step, self._page_count() - 1))
+        self._show_results_page()
+    
+    def _page_count(self) -> int:
+        """Get the number of result pages for the current filter."""
+        result_count = self.comparison_results.count(FILTER_MATCH_STATUSES[self.current_filter])
+        return max(1, (result_count + RESULTS_PAGE_SIZE - 1) // RESULTS_PAGE_SIZE)
+    
+    def _show_results_page(self) -> None:
+        """Load the current page of results from the store and display it."""
         self.reg_file_output.clear()
         self.system_output.clear()
         
+        results = self.comparison_results.page(
+            FILTER_MATCH_STATUSES[self.current_filter], self.current_page * RESULTS_PAGE_SIZE, RESULTS_PAGE_SIZE
+        )
         current_path = None
-        for result in self.comparison_results:
-            if self._should_show_result(result, filter_type):
-                if current_path != result.path:
-                    if current_path is not None:
-                        self.reg_file_output.append("")
-                        self.system_output.append("")
-                    self.reg_file_output.append(f"[{result.path}]")
-                    self.system_output.append(f"[{result.path}]")
-                    current_path = result.path
-                
-                self.reg_file_output.append(f'  "{result.key_name}"={result.file_display}')
-                self.system_output.append(f'  "{result.key_name}"={result.system_display}')
-    
-    def _should_show_result(self, result: ComparisonResult, filter_type: str) -> bool:
-        """Determine if result should be shown based on filter."""
-        filter_map = {
-            "all": True,
-            "matches": result.match_status == ComparisonStatus.MATCH.value,
-            "differences": result.match_status == ComparisonStatus.DIFFERENT.value,
-            "missing": result.match_status == ComparisonStatus.MISSING.value,
-        }
-        return filter_map.get(filter_type, False)
+        for result in results:
+            if current_path != result.path:
+                if current_path is not None:
+                    self.reg_file_output.append("")
+                    self.system_output.append("")
+                self.reg_file_output.append(f"[{result.path}]")
+                self.system_output.append(f"[{result.path}]")
+                current_path = result.path
+            
+            self.reg_file_output.append(f'  "{result.key_name}"={result.file_display}')
+            self.system_output.append(f'  "{result.key_name}"={result.system_display}')
+        
+        self._update_page_controls()
+    
+    def _update_page_controls(self) -> None:
+        """Update the page label and paging buttons."""
+        page_count = self._page_count()
+        self.page_label.setText(f"Page {self.current_page + 1} of {page_count}")
+        self.btn_previous_page.setEnabled(self.current_page > 0)
+        self.btn_next_page.setEnabled(self.current_page < page_count - 1)
+    
+    def _show_result_tree(self) -> None:
+        """Show the top-level hives of the result tree; deeper levels load on expansion."""
+        self.result_tree.clear()
+        for name, path in self.result_index.children():
+            self.result_tree.addTopLevelItem(self._create_tree_key_item(name, path))
+    
+    def _create_tree_key_item(self, name: str, path: str) -> QTreeWidgetItem:
+        """Create a key node whose children are loaded on first expansion."""
+        item = QTreeWidgetItem([name])
+        item.setData(0, Qt.ItemDataRole.UserRole, path)
+        if self.result_index.has_children(path) or self.result_index.is_section(path):
+            item.addChild(QTreeWidgetItem([TREE_PLACEHOLDER_TEXT]))
+        return item
+    
+    def _create_tree_value_item(self, result: ComparisonResult) -> QTreeWidgetItem:
+        """Create a leaf node for a compared value."""
+        return QTreeWidgetItem([f'"{result.key_name}"', result.match_status, result.file_display, result.system_display])
+    
+    def _populate_tree_item(self, item: QTreeWidgetItem) -> None:
+        """Load the subkeys and values of a key node the first time it is expanded."""
+        if item.childCount() != 1 or item.child(0).text(0) != TREE_PLACEHOLDER_TEXT:
+            return
+        
+        item.takeChild(0)
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        for name, child_path in self.result_index.children(path):
+            item.addChild(self._create_tree_key_item(name, child_path))
+        section_path = self.result_index.section_path(path)
+        if section_path is not None:
+            for result in self.comparison_results.for_path(section_path):
+                item.addChild(self._create_tree_value_item(result))
+    
+    def _search_results(self) -> None:
+        """Filter the tree to sections and values whose path or name contains the search text."""
+        text = self.search_input.text().strip()
+        if not text:
+            self.search_status_label.setText("")
+            self._show_result_tree()
+            return
+        
+        path_matches, path_total = self.result_index.search(text, SEARCH_RESULT_LIMIT)
+        value_matches, value_total = self.comparison_results.search_values(
+            text, SEARCH_RESULT_LIMIT - len(path_matches)
+        )
+        total = path_total + value_total
+        self.result_tree.clear()
+        for path in path_matches:
+            self.result_tree.addTopLevelItem(self._create_tree_key_item(path, path))
+        
+        sections: Dict[str, QTreeWidgetItem] = {}
+        for result in value_matches:
+            if result.path not in sections:
+                sections[result.path] = QTreeWidgetItem([result.path])
+                self.result_tree.addTopLevelItem(sections[result.path])
+                sections[result.path].setExpanded(True)
+            sections[result.path].addChild(self._create_tree_value_item(result))
+        
+        shown = f" (showing the first {SEARCH_RESULT_LIMIT})" if total > SEARCH_RESULT_LIMIT else ""
+        self.search_status_label.setText(f"{total} matches{shown}")
     
     def _compare_registry(self) -> None:
         """Perform registry comparison."""
@@ -703,7 +2478,10 @@ class RegistryUtilityApp(QMainWindow):
             parsed_settings = self._parse_input_file(self.input_file_path_compare, self._log_compare)
             comparison_stats = self._perform_comparison(parsed_settings)
             self._enable_filter_buttons()
+            self._filter_results("all")
+            self._show_result_tree()
             self._show_comparison_summary(comparison_stats)
+            self._record_history()
             self._show_completion_dialog(comparison_stats)
         except Exception as e:
             self._handle_error(str(e), self._log_compare)
@@ -712,13 +2490,22 @@ class RegistryUtilityApp(QMainWindow):
         """Clear comparison output areas."""
         self.reg_file_output.clear()
         self.system_output.clear()
-        self.comparison_results = []
+        self.comparison_results.close()
+        self.comparison_results = InMemoryResultStore()
+        self.result_index = ResultPathIndex()
+        self.result_tree.clear()
+        self.search_input.clear()
+        self.search_input.setEnabled(False)
+        self.page_label.setText("")
+        self.btn_previous_page.setEnabled(False)
+        self.btn_next_page.setEnabled(False)
     
     def _parse_input_file(self, file_path: str, log_callback: Callable[[str], None]) -> Dict[str, Dict[str, str]]:
         """Parse input registry file."""
         log_callback("Step 1: Parsing .reg file...")
-        parsed_settings = parse_reg_file(file_path)
-        log_callback(f"Parsing complete. Found {len(parsed_settings)} key sections.")
+        parsed_settings = self.parse_cache.load(file_path, log_callback)
+        source = "Loaded from cache" if self.parse_cache.last_hit else "Parsing complete"
+        log_callback(f"{source}. Found {len(parsed_settings)} key sections.")
         return parsed_settings
     
     def _perform_comparison(self, parsed_settings: Dict[str, Dict[str, str]]) -> Dict[str, int]:
@@ -726,18 +2513,29 @@ class RegistryUtilityApp(QMainWindow):
         self._log_compare("Step 2: Comparing values...")
         
         stats = {"total": 0, "matches": 0, "differences": 0, "missing": 0, "errors": 0}
+        value_count = sum(len(keys) for keys in parsed_settings.values())
+        self.comparison_results = create_result_store(value_count)
+        if isinstance(self.comparison_results, SqliteResultStore):
+            self._log_compare(f"Large comparison ({value_count} values): results are stored on disk.")
         
-        for path, keys in parsed_settings.items():
-            self._add_path_headers(path)
-            
-            for key_name, file_value in keys.items():
-                result = self._compare_single_value(path, key_name, file_value)
-                self.comparison_results.append(result)
-                self._update_stats(stats, result.match_status)
-                self._add_comparison_output(result)
-            
-            self._add_section_separator()
+        for group, reads in iter_registry_reads(parsed_settings, self._log_compare):
+            for path in group.paths:
+                show_live = len(self.comparison_results) < RESULTS_PAGE_SIZE
+                if show_live:
+                    self._add_path_headers(path)
+                
+                for key_name, file_value in parsed_settings[path].items():
+                    result = self._compare_single_value(path, key_name, file_value, reads)
+                    self.comparison_results.add(result)
+                    self.result_index.add(result)
+                    self._update_stats(stats, result.match_status)
+                    if show_live:
+                        self._add_comparison_output(result)
+                
+                if show_live:
+                    self._add_section_separator()
         
+        self.comparison_results.flush()
         return stats
     
     def _add_path_headers(self, path: str) -> None:
@@ -745,34 +2543,16 @@ class RegistryUtilityApp(QMainWindow):
         self.reg_file_output.append(f"[{path}]")
         self.system_output.append(f"[{path}]")
     
-    def _compare_single_value(self, path: str, key_name: str, file_value: str) -> ComparisonResult:
-        """Compare a single registry value."""
-        full_key_path = f'{path}\\{key_name}'
-        system_value, system_status = get_current_registry_value(full_key_path, self._log_compare)
-        match_status, file_display, system_display = compare_values(file_value, system_value, system_status)
-        
-        return ComparisonResult(
-            path=path,
-            key_name=key_name,
-            file_value=file_value,
-            system_value=system_value,
-            file_display=file_display,
-            system_display=system_display,
-            match_status=match_status,
-            system_status=system_status
-        )
+    def _compare_single_value(self, path: str, key_name: str, file_value: str,
+                              reads: Dict[str, Tuple[Optional[Tuple[Any, int]], str, str]]) -> ComparisonResult:
+        """Compare a single registry value against its planned read."""
+        read = reads[parse_registry_value_name(key_name).casefold()]
+        system_value, system_status = format_planned_read(read)
+        return build_comparison_result(path, key_name, file_value, system_value, system_status)
     
     def _update_stats(self, stats: Dict[str, int], match_status: str) -> None:
         """Update comparison statistics."""
-        stats["total"] += 1
-        if match_status == ComparisonStatus.MATCH.value:
-            stats["matches"] += 1
-        elif match_status == ComparisonStatus.DIFFERENT.value:
-            stats["differences"] += 1
-        elif match_status == ComparisonStatus.MISSING.value:
-            stats["missing"] += 1
-        elif match_status == ComparisonStatus.ERROR.value:
-            stats["errors"] += 1
+        update_comparison_stats(stats, match_status)
     
     def _add_comparison_output(self, result: ComparisonResult) -> None:
         """Add comparison result to output."""
@@ -788,6 +2568,7 @@ class RegistryUtilityApp(QMainWindow):
         """Enable filter buttons after comparison."""
         for button in self.filter_buttons:
             button.setEnabled(True)
+        self.search_input.setEnabled(True)
     
     def _show_comparison_summary(self, stats: Dict[str, int]) -> None:
         """Show comparison summary in log."""
@@ -799,6 +2580,33 @@ class RegistryUtilityApp(QMainWindow):
         self._log_compare(f"  {STATUS_ERROR} Errors: {stats['errors']}")
         self._log_compare("Comparison complete.")
     
+    def _record_history(self) -> None:
+        """Append the finished comparison to the history store, keeping the window responsive, and log the drift."""
+        self._log_compare("Recording comparison history...")
+        self._recording_history = True
+        self.btn_compare.setEnabled(False)
+        try:
+            if self.history_store is None:
+                self.history_store = HistoryStore()
+            run = self.history_store.record_run(self.input_file_path_compare, self.comparison_results,
+                                                progress_callback=QApplication.processEvents)
+            drifting = self.history_store.drifting_values(self.input_file_path_compare, HISTORY_LOG_DRIFTING_LIMIT)
+        except (sqlite3.Error, OSError) as e:
+            self._log_compare(f"Warning: Could not record comparison history: {e}")
+            return
+        finally:
+            self._recording_history = False
+            self.btn_compare.setEnabled(self.input_file_path_compare is not None)
+            if self._close_requested:
+                QTimer.singleShot(0, self.close)
+        
+        self._log_compare(f"History: recorded run {run.run_id}, {run.changed} values changed status since the previous run.")
+        for value in drifting:
+            self._log_compare(f'  [{value.path}] "{value.key_name}": {value.match_status} '
+                              f"since {format_history_time(value.since.started_at)}")
+        if len(drifting) == HISTORY_LOG_DRIFTING_LIMIT:
+            self._log_compare(f"  (showing the first {HISTORY_LOG_DRIFTING_LIMIT}; run with --history for the full list)")
+    
     def _show_completion_dialog(self, stats: Dict[str, int]) -> None:
         """Show completion dialog with statistics."""
         message = (
@@ -822,7 +2630,10 @@ class RegistryUtilityApp(QMainWindow):
         
         try:
             parsed_settings = self._parse_input_file(self.input_file_path_backup, self._log_backup)
-            current_values = self._get_current_values_for_backup(parsed_settings)
+            if self.chk_minimal_backup.isChecked():
+                parsed_settings, current_values = self._get_minimal_values_for_backup(parsed_settings)
+            else:
+                current_values = self._get_current_values_for_backup(parsed_settings)
             output_path = self._get_backup_output_path()
             
             if output_path:
@@ -840,6 +2651,16 @@ class RegistryUtilityApp(QMainWindow):
         self._log_backup("Reading current values complete.")
         return current_values
     
+    def _get_minimal_values_for_backup(self, parsed_settings: Dict[str, Dict[str, str]]
+                                       ) -> Tuple[Dict[str, Dict[str, str]], Dict[str, str]]:
+        """Get the values that would change and their current registry values for a minimal backup."""
+        self._log_backup("Step 2: Reading current values and skipping those that already match...")
+        changed_settings, current_values = get_minimal_backup_values(parsed_settings, self._log_backup)
+        total = sum(len(keys) for keys in parsed_settings.values())
+        changed = sum(len(keys) for keys in changed_settings.values())
+        self._log_backup(f"Reading current values complete. {changed} of {total} values would change.")
+        return changed_settings, current_values
+    
     def _get_backup_output_path(self) -> Optional[str]:
         """Get output path for backup file."""
         default_name = f"{os.path.splitext(os.path.basename(self.input_file_path_backup))[0]}_backup.reg"
@@ -867,10 +2688,65 @@ class RegistryUtilityApp(QMainWindow):
         self._log_backup("----")
         QMessageBox.information(self, "Success", success_msg)
     
+    def _apply_reg_file(self) -> None:
+        """Apply the selected registry file with verification and automatic rollback."""
+        if not self.input_file_path_backup:
+            self._log_backup("Error: No input file has been selected.")
+            return
+        
+        answer = QMessageBox.question(
+            self, "Apply Registry File",
+            f"Write every value from {os.path.basename(self.input_file_path_backup)} to the registry?\n\n"
+            "Each value is verified after writing and all changes are rolled back if anything fails."
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            self._log_backup("Apply cancelled.")
+            return
+        
+        self._log_backup("\nStarting apply process...")
+        self._set_backup_ui_busy(True)
+        
+        try:
+            parsed_settings = self._parse_input_file(self.input_file_path_backup, self._log_backup)
+            self._log_backup("Step 2: Writing and verifying values...")
+            report = RegistryApplyEngine(log_callback=self._log_backup).apply(parsed_settings)
+            for line in format_apply_report(report):
+                self._log_backup(line)
+            if report.success:
+                self._show_apply_success(report)
+            else:
+                self._handle_error("\n".join(report.errors), self._log_backup)
+        except Exception as e:
+            self._handle_error(str(e), self._log_backup)
+        finally:
+            self._set_backup_ui_busy(False)
+    
+    def _show_apply_success(self, report: ApplyReport) -> None:
+        """Show apply success message."""
+        success_msg = f"Applied and verified {report.values_verified} values in {report.keys_written} keys."
+        self._log_backup("\n----")
+        self._log_backup(f"{STATUS_MATCH} SUCCESS!")
+        self._log_backup(success_msg)
+        self._log_backup("----")
+        QMessageBox.information(self, "Success", success_msg)
+    
     def _set_backup_ui_busy(self, busy: bool) -> None:
         """Set backup UI busy state."""
         self.btn_select_file_backup.setEnabled(not busy)
+        self.chk_minimal_backup.setEnabled(not busy)
         self.btn_generate_backup.setEnabled(not busy and self.input_file_path_backup is not None)
+        self.btn_apply.setEnabled(not busy and self.input_file_path_backup is not None)
+    
+    def closeEvent(self, event) -> None:
+        """Release the result and history stores when the window closes, waiting for history recording to finish."""
+        if self._recording_history:
+            self._close_requested = True
+            event.ignore()
+            return
+        self.comparison_results.close()
+        if self.history_store is not None:
+            self.history_store.close()
+        super().closeEvent(event)
     
     def _handle_error(self, error_message: str, log_callback: Callable[[str], None]) -> None:
         """Handle and display errors."""
@@ -883,8 +2759,6 @@ class RegistryUtilityApp(QMainWindow):
 def validate_windows_system() -> None:
     """Validate that the application is running on Windows."""
     if not is_windows_system():
-        app = QApplication(sys.argv)
-        app.setStyleSheet(MODERN_DARK_STYLESHEET)
         QMessageBox.critical(
             None,
             "Compatibility Error",
@@ -892,15 +2766,97 @@ def validate_windows_system() -> None:
         )
         sys.exit(1)
 
+class StartupBenchmark(QObject):
+    """Measures start-up milestones up to the first paint of the main window."""
+
+    def __init__(self, app: QApplication, window: QMainWindow, budget_ms: Optional[float] = None):
+        super().__init__()
+        self.app = app
+        self.window = window
+        self.budget_ms = budget_ms
+        self.marks = {
+            "imports": STARTUP_IMPORTED_AT,
+            "window_created": time.perf_counter(),
+        }
+        app.installEventFilter(self)
+
+    def eventFilter(self, watched, event) -> bool:
+        """Record the first paint of any widget in the main window."""
+        if ("first_paint" not in self.marks and event.type() == QEvent.Type.Paint
+                and isinstance(watched, QWidget) and watched.window() is self.window):
+            self.marks["first_paint"] = time.perf_counter()
+            self._finish_if_complete()
+        return False
+
+    def mark_setup_finished(self) -> None:
+        """Record that the deferred set-up work has completed."""
+        self.marks["setup_finished"] = time.perf_counter()
+        self._finish_if_complete()
+
+    def elapsed_ms(self) -> Dict[str, float]:
+        """Get every milestone in milliseconds since the module started loading."""
+        return {name: (moment - STARTUP_STARTED_AT) * 1000 for name, moment in self.marks.items()}
+
+    def _finish_if_complete(self) -> None:
+        """Report the timings and quit once both the paint and the set-up are done."""
+        if "first_paint" not in self.marks or "setup_finished" not in self.marks:
+            return
+        self.app.removeEventFilter(self)
+        elapsed = self.elapsed_ms()
+        print(" ".join(f"{name}={milliseconds:.1f}ms" for name, milliseconds in elapsed.items()))
+        over_budget = self.budget_ms is not None and elapsed["first_paint"] > self.budget_ms
+        if over_budget:
+            print(f"First paint exceeded the budget of {self.budget_ms:.1f}ms.")
+        self.app.exit(1 if over_budget else 0)
+
+def parse_command_line(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """Parse command line options, leaving unknown arguments for Qt."""
+    parser = argparse.ArgumentParser(description="Compare and back up Windows Registry files.")
+    parser.add_argument("--watch", metavar="REG_FILE",
+                        help="monitor the registry for drift from a baseline .reg file instead of opening the GUI")
+    parser.add_argument("--interval", type=float, default=DRIFT_POLL_INTERVAL_SECONDS,
+                        help="seconds between drift checks in watch mode")
+    parser.add_argument("--all-users", metavar="REG_FILE",
+                        help="compare the HKEY_CURRENT_USER settings of a .reg file against every loaded user profile")
+    parser.add_argument("--apply", metavar="REG_FILE",
+                        help="write a .reg file with verification and automatic rollback instead of opening the GUI")
+    parser.add_argument("--history", metavar="REG_FILE",
+                        help="print recent comparison runs of a .reg file and when each drifting value started drifting")
+    parser.add_argument("--benchmark-startup", action="store_true",
+                        help="print start-up timings up to the first paint and exit")
+    parser.add_argument("--startup-budget-ms", type=float, default=None,
+                        help="with --benchmark-startup, exit with an error if the first paint takes longer than this")
+    return parser.parse_known_args(argv[1:])
+
 def main() -> None:
     """Main application entry point."""
-    validate_windows_system()
+    args, qt_args = parse_command_line(sys.argv)
+    if args.watch:
+        run_drift_monitor(args.watch, args.interval)
+        return
+    if args.all_users:
+        run_user_profile_comparison(args.all_users)
+        return
+    if args.apply:
+        run_apply(args.apply)
+        return
+    if args.history:
+        run_history_report(args.history)
+        return
+    if not GUI_AVAILABLE:
+        print("The graphical interface requires PyQt6. Install it with: pip install PyQt6")
+        sys.exit(1)
     
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyleSheet(MODERN_DARK_STYLESHEET)
+    validate_windows_system()
     
     window = RegistryUtilityApp()
+    benchmark = StartupBenchmark(app, window, args.startup_budget_ms) if args.benchmark_startup else None
     window.show()
+    QTimer.singleShot(0, window.finish_setup)
+    if benchmark:
+        QTimer.singleShot(0, benchmark.mark_setup_finished)
     
     sys.exit(app.exec())
 
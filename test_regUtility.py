@@ -0,0 +1,433 @@
+"""Tests for the registry logic of regUtility against the in-memory registry stand-in."""
+
+import os
+import shutil
+
+import pytest
+
+import regUtility
+from regUtility import (
+    ComparisonStatus, DriftMonitor, InMemoryRegistry, InMemoryResultStore, RegistryApplyEngine, ResultPathIndex,
+    HistoryStore, ParseCache, SqliteResultStore, build_comparison_result, compare_all_user_profiles,
+    create_backup_entry, get_minimal_backup_values, list_user_sids, parse_reg_file, read_registry_values, write_backup_file, winreg
+)
+
+POLICY_PATH = r"HKEY_LOCAL_MACHINE\Software\Policies\Example"
+OTHER_PATH = r"HKEY_LOCAL_MACHINE\Software\Other"
+USER_PATH = r"HKEY_CURRENT_USER\Software\Example"
+FIRST_SID = "S-1-5-21-1000-1001"
+SECOND_SID = "S-1-5-21-1000-1002"
+
+def make_baseline():
+    return {
+        POLICY_PATH: {"Enabled": "dword:00000001", "Name": '"example"'},
+        OTHER_PATH: {"Level": "dword:00000003"},
+    }
+
+def make_matching_registry(notifications: bool = True) -> InMemoryRegistry:
+    registry = InMemoryRegistry(notifications=notifications)
+    registry.write_value(POLICY_PATH, "Enabled", 1, winreg.REG_DWORD)
+    registry.write_value(POLICY_PATH, "Name", "example", winreg.REG_SZ)
+    registry.write_value(OTHER_PATH, "Level", 3, winreg.REG_DWORD)
+    return registry
+
+def test_drift_monitor_reports_only_initial_mismatches():
+    registry = make_matching_registry()
+    registry.remove_value(OTHER_PATH, "Level")
+    monitor = DriftMonitor(make_baseline(), registry)
+
+    events = monitor.start()
+
+    assert [(event.path, event.key_name, event.previous_status) for event in events] == [
+        (OTHER_PATH, "Level", None)
+    ]
+    assert events[0].result.match_status == ComparisonStatus.MISSING.value
+
+def test_drift_monitor_reports_changes_and_recovery():
+    registry = make_matching_registry()
+    monitor = DriftMonitor(make_baseline(), registry)
+    assert monitor.start() == []
+
+    registry.write_value(POLICY_PATH, "Enabled", 0, winreg.REG_DWORD)
+    events = monitor.tick()
+    assert [(event.key_name, event.previous_status, event.result.match_status) for event in events] == [
+        ("Enabled", ComparisonStatus.MATCH.value, ComparisonStatus.DIFFERENT.value)
+    ]
+
+    assert monitor.tick() == []
+
+    registry.write_value(POLICY_PATH, "Enabled", 1, winreg.REG_DWORD)
+    events = monitor.tick()
+    assert [(event.key_name, event.result.match_status) for event in events] == [
+        ("Enabled", ComparisonStatus.MATCH.value)
+    ]
+
+def test_drift_monitor_rescans_only_changed_keys():
+    registry = make_matching_registry()
+    monitor = DriftMonitor(make_baseline(), registry)
+    monitor.start()
+    rescanned = []
+    original_rescan = monitor._rescan_key
+    monitor._rescan_key = lambda path: rescanned.append(path) or original_rescan(path)
+
+    registry.write_value(OTHER_PATH, "Level", 4, winreg.REG_DWORD)
+    monitor.tick()
+
+    assert rescanned == [OTHER_PATH]
+
+def test_drift_monitor_falls_back_to_timestamp_polling():
+    registry = make_matching_registry(notifications=False)
+    monitor = DriftMonitor(make_baseline(), registry)
+    monitor.start()
+
+    registry.remove_key(OTHER_PATH)
+    events = monitor.tick()
+
+    assert [(event.path, event.result.match_status) for event in events] == [
+        (OTHER_PATH, ComparisonStatus.MISSING.value)
+    ]
+
+def test_drift_monitor_reads_default_values_and_backslash_names():
+    registry = InMemoryRegistry()
+    monitor = DriftMonitor({POLICY_PATH: {"@": '"default"', r"C:\Tools": '"allowed"'}}, registry)
+    assert [event.result.match_status for event in monitor.start()] == [ComparisonStatus.MISSING.value] * 2
+
+    registry.write_value(POLICY_PATH, "", "default", winreg.REG_SZ)
+    registry.write_value(POLICY_PATH, r"C:\Tools", "allowed", winreg.REG_SZ)
+    events = monitor.tick()
+
+    assert sorted((event.key_name, event.result.match_status) for event in events) == [
+        ("@", ComparisonStatus.MATCH.value), (r"C:\Tools", ComparisonStatus.MATCH.value)
+    ]
+
+def make_user_registry() -> InMemoryRegistry:
+    registry = InMemoryRegistry()
+    registry.write_value(rf"HKEY_USERS\{FIRST_SID}\Software\Example", "Theme", "dark", winreg.REG_SZ)
+    registry.write_value(rf"HKEY_USERS\{FIRST_SID}\Software\Example", "", "default", winreg.REG_SZ)
+    registry.write_value(rf"HKEY_USERS\{SECOND_SID}\Software\Example", "Theme", "light", winreg.REG_SZ)
+    registry.write_value(rf"HKEY_USERS\{SECOND_SID}_Classes\Software", "Ignored", 1, winreg.REG_DWORD)
+    registry.write_value(r"HKEY_USERS\.DEFAULT\Software", "Ignored", 1, winreg.REG_DWORD)
+    return registry
+
+def test_list_user_sids_skips_default_and_classes_hives():
+    assert list_user_sids(make_user_registry()) == [FIRST_SID, SECOND_SID]
+
+def test_compare_all_user_profiles_builds_per_sid_matrix():
+    parsed = {
+        USER_PATH: {"Theme": '"dark"', "@": '"default"'},
+        POLICY_PATH: {"Enabled": "dword:00000001"},
+    }
+
+    matrix = compare_all_user_profiles(parsed, make_user_registry())
+
+    assert matrix.sids == [FIRST_SID, SECOND_SID]
+    assert sorted(matrix.rows()) == [(USER_PATH, "@"), (USER_PATH, "Theme")]
+    assert matrix.cell(USER_PATH, "Theme", FIRST_SID).match_status == ComparisonStatus.MATCH.value
+    assert matrix.cell(USER_PATH, "@", FIRST_SID).match_status == ComparisonStatus.MATCH.value
+    assert matrix.cell(USER_PATH, "Theme", SECOND_SID).match_status == ComparisonStatus.DIFFERENT.value
+    assert matrix.cell(USER_PATH, "@", SECOND_SID).match_status == ComparisonStatus.MISSING.value
+    assert matrix.summary()[SECOND_SID]["differences"] == 1
+
+class FailingRegistry(InMemoryRegistry):
+    """In-memory registry that refuses to write values named "Blocked"."""
+
+    def set_value(self, key_handle, value_name, value, reg_type):
+        if value_name == "Blocked":
+            raise PermissionError("Access is denied")
+        super().set_value(key_handle, value_name, value, reg_type)
+
+def test_apply_writes_and_verifies_values():
+    registry = InMemoryRegistry()
+    engine = RegistryApplyEngine(registry)
+
+    report = engine.apply({POLICY_PATH: {"Enabled": "dword:00000001", "@": '"default"', "Data": "hex:01,02"}})
+
+    assert report.success
+    assert (report.keys_written, report.values_written, report.values_verified) == (1, 3, 3)
+    assert registry.read_value("HKEY_LOCAL_MACHINE", r"Software\Policies\Example", "") == ("default", winreg.REG_SZ)
+    assert registry.read_value("HKEY_LOCAL_MACHINE", r"Software\Policies\Example", "Data") == (
+        b"\x01\x02", winreg.REG_BINARY
+    )
+
+def test_apply_rolls_back_values_of_existing_keys():
+    registry = FailingRegistry()
+    registry.write_value(POLICY_PATH, "Enabled", 0, winreg.REG_DWORD)
+    registry.write_value(r"HKEY_LOCAL_MACHINE\Software\Locked", "Keep", 1, winreg.REG_DWORD)
+
+    report = RegistryApplyEngine(registry).apply({
+        POLICY_PATH: {"Enabled": "dword:00000001", "Added": '"new"'},
+        r"HKEY_LOCAL_MACHINE\Software\Locked": {"Keep": "dword:00000002", "Blocked": '"x"'},
+    })
+
+    assert report.rolled_back and not report.success
+    assert registry.read_value("HKEY_LOCAL_MACHINE", r"Software\Policies\Example", "Enabled") == (0, winreg.REG_DWORD)
+    with pytest.raises(FileNotFoundError):
+        registry.read_value("HKEY_LOCAL_MACHINE", r"Software\Policies\Example", "Added")
+
+def test_apply_rollback_removes_created_keys_and_parents():
+    registry = FailingRegistry()
+    registry.write_value(r"HKEY_LOCAL_MACHINE\Software\Locked", "Keep", 1, winreg.REG_DWORD)
+
+    report = RegistryApplyEngine(registry).apply({
+        r"HKEY_LOCAL_MACHINE\Software\New\Leaf\Child": {"v": '"1"'},
+        r"HKEY_LOCAL_MACHINE\Software\New\Leaf": {"w": '"1"'},
+        r"HKEY_LOCAL_MACHINE\Software\Locked": {"Keep": "dword:00000002", "Blocked": '"x"'},
+    })
+
+    assert report.rolled_back
+    assert report.errors == [r"Error applying [HKEY_LOCAL_MACHINE\Software\Locked]: Access is denied"]
+    assert registry.list_subkeys("HKEY_LOCAL_MACHINE", "Software") == ["Locked"]
+    assert registry.read_value("HKEY_LOCAL_MACHINE", r"Software\Locked", "Keep") == (1, winreg.REG_DWORD)
+
+def test_apply_plan_rejects_invalid_values_before_writing():
+    registry = InMemoryRegistry()
+
+    with pytest.raises(ValueError):
+        RegistryApplyEngine(registry).apply({POLICY_PATH: {"Enabled": "dword:00000001", "Bad": "bogus:1"}})
+    assert registry.list_subkeys("HKEY_LOCAL_MACHINE", "") == []
+
+def test_apply_joins_wrapped_hex_values_from_regedit_exports(tmp_path):
+    reg_file = tmp_path / "export.reg"
+    reg_file.write_text(
+        "Windows Registry Editor Version 5.00\n\n"
+        f"[{POLICY_PATH}]\n"
+        '"Data"=hex:01,02,03,\\\n  04,05\n'
+        '"List"=hex(7):\\\n  61,00,00,00,\\\n  00,00\n'
+        '"Path"="C:\\\\"\n'
+        "; note,\\\n"
+        '"After"="1"\n',
+        encoding="utf-16",
+    )
+    registry = InMemoryRegistry()
+
+    report = RegistryApplyEngine(registry).apply(parse_reg_file(str(reg_file)))
+
+    assert report.success
+    key_path = r"Software\Policies\Example"
+    assert registry.read_value("HKEY_LOCAL_MACHINE", key_path, "Data") == (b"\x01\x02\x03\x04\x05", winreg.REG_BINARY)
+    assert registry.read_value("HKEY_LOCAL_MACHINE", key_path, "List") == (["a"], winreg.REG_MULTI_SZ)
+    assert registry.read_value("HKEY_LOCAL_MACHINE", key_path, "Path") == ("C:\\", winreg.REG_SZ)
+    assert registry.read_value("HKEY_LOCAL_MACHINE", key_path, "After") == ("1", winreg.REG_SZ)
+
+def test_reads_are_case_insensitive_for_root_keys_paths_and_names():
+    registry = make_matching_registry()
+    parsed = {r"hkey_local_machine\SOFTWARE\policies\example": {"ENABLED": "dword:00000001"}}
+
+    reads = read_registry_values(parsed, lambda message: None, registry)
+
+    assert list(reads.values()) == [((1, winreg.REG_DWORD), "found", "")]
+
+def test_backup_restores_default_values(tmp_path):
+    backup_file = tmp_path / "backup.reg"
+    parsed = {POLICY_PATH: {"@": '"new"', "Name": '"new"', "Added": '"new"'}}
+    current_values = {
+        f"{POLICY_PATH}\\@": create_backup_entry("@", "old default", winreg.REG_SZ),
+        f"{POLICY_PATH}\\Name": create_backup_entry("Name", "old name", winreg.REG_SZ),
+    }
+
+    write_backup_file(parsed, current_values, str(backup_file))
+
+    assert backup_file.read_text(encoding="utf-16").splitlines()[3:6] == [
+        '@="old default"', '"Name"="old name"', '"Added"=-'
+    ]
+    assert parse_reg_file(str(backup_file)) == {POLICY_PATH: {"@": '"old default"', "Name": '"old name"', "Added": "-"}}
+
+def make_result(path: str, key_name: str):
+    return build_comparison_result(path, key_name, '"x"', '"x"', "found")
+
+@pytest.mark.parametrize("store_class", [InMemoryResultStore, SqliteResultStore])
+def test_tree_sections_use_their_own_spelling(store_class):
+    store = store_class()
+    index = ResultPathIndex()
+    for result in (make_result(r"HKLM\Software\Foo\Bar", "Inner"), make_result(r"HKLM\SOFTWARE\Foo", "Outer")):
+        store.add(result)
+        index.add(result)
+
+    name, node_path = index.children(r"HKLM\Software")[0]
+
+    assert (name, node_path) == ("Foo", r"HKLM\Software\Foo")
+    assert [result.key_name for result in store.for_path(index.section_path(node_path))] == ["Outer"]
+    assert index.section_path(r"HKLM\Software") is None
+    store.close()
+
+@pytest.mark.parametrize("store_class", [InMemoryResultStore, SqliteResultStore])
+def test_search_finds_sections_and_value_names_case_insensitively(store_class):
+    store = store_class()
+    index = ResultPathIndex()
+    for result in (make_result(r"HKLM\Software\Proxy", "Enable"), make_result(r"HKLM\Software\Other", "ProxyServer"),
+                   make_result(r"HKLM\Software\Other", "Level")):
+        store.add(result)
+        index.add(result)
+
+    assert index.search("PROXY", 10) == ([r"HKLM\Software\Proxy"], 1)
+    matches, total = store.search_values("PROXY", 10)
+    assert [(result.path, result.key_name) for result in matches] == [(r"HKLM\Software\Other", "ProxyServer")]
+    assert total == 1
+    assert store.search_values("e", 1)[1] == 3
+    store.close()
+
+def make_status_result(key_name: str, match_status: str):
+    result = make_result(POLICY_PATH, key_name)
+    result.match_status = match_status
+    return result
+
+def test_history_stores_only_status_changes(tmp_path):
+    history = HistoryStore(str(tmp_path / "history.sqlite3"))
+    match, different = ComparisonStatus.MATCH.value, ComparisonStatus.DIFFERENT.value
+
+    first = history.record_run("policy.reg", [make_status_result("A", match), make_status_result("B", match)], 1.0)
+    second = history.record_run("policy.reg", [make_status_result("a", match), make_status_result("B", different)], 2.0)
+    third = history.record_run("policy.reg", [make_status_result("B", different)], 3.0)
+
+    assert [run.changed for run in (first, second, third)] == [2, 1, 1]
+    assert [(run.run_id, run.differences) for run in history.runs("policy.reg")] == [(1, 0), (2, 1), (3, 1)]
+    assert [change.match_status for change in history.timeline("policy.reg", POLICY_PATH, "A")] == [
+        match, "not_compared"
+    ]
+    assert history.drifting_since("policy.reg", POLICY_PATH, "B").run_id == second.run_id
+    assert [(value.key_name, value.since.started_at) for value in history.drifting_values("policy.reg")] == [("B", 2.0)]
+    history.close()
+
+def test_sqlite_store_iterates_every_result_in_order():
+    store = SqliteResultStore(batch_size=3)
+    for index in range(10):
+        store.add(make_result(POLICY_PATH, f"Value{index}"))
+
+    assert [result.key_name for result in store] == [f"Value{index}" for index in range(10)]
+    store.close()
+
+def test_minimal_backup_keeps_only_values_that_would_change(tmp_path):
+    registry = make_matching_registry()
+    parsed = {
+        POLICY_PATH: {"Enabled": "dword:00000000", "Name": '"example"', "Absent": "-"},
+        OTHER_PATH: {"Level": "dword:00000003", "Gone": "-"},
+    }
+
+    changed_settings, current_values = get_minimal_backup_values(parsed, lambda message: None, registry)
+
+    assert changed_settings == {POLICY_PATH: {"Enabled": "dword:00000000"}}
+    assert current_values == {f"{POLICY_PATH}\\Enabled": '"Enabled"=dword:00000001\r\n'}
+
+    backup_file = tmp_path / "backup.reg"
+    write_backup_file(changed_settings, current_values, str(backup_file))
+    assert parse_reg_file(str(backup_file)) == {POLICY_PATH: {"Enabled": "dword:00000001"}}
+    assert f"[{OTHER_PATH}]" not in backup_file.read_text(encoding="utf-16")
+
+def write_reg_file(path, sections):
+    lines = ["Windows Registry Editor Version 5.00", ""]
+    for section, values in sections.items():
+        lines.append(f"[{section}]")
+        lines.extend(f'"{name}"={value}' for name, value in values.items())
+        lines.append("")
+    path.write_text("\n".join(lines), encoding="utf-16")
+    return str(path)
+
+def count_hashes(monkeypatch):
+    calls = []
+    original_hash = regUtility.hash_file_content
+    monkeypatch.setattr(regUtility, "hash_file_content", lambda path: calls.append(path) or original_hash(path))
+    return calls
+
+def test_parse_cache_misses_then_hits(tmp_path, monkeypatch):
+    reg_file = write_reg_file(tmp_path / "policy.reg", {POLICY_PATH: {"Enabled": "dword:00000001"}})
+    cache = ParseCache(str(tmp_path / "cache"))
+    hashes = count_hashes(monkeypatch)
+
+    first = cache.load(reg_file)
+    assert not cache.last_hit
+    second = cache.load(reg_file)
+
+    assert cache.last_hit
+    assert first == second == {POLICY_PATH: {"Enabled": "dword:00000001"}}
+    assert len(hashes) == 1
+
+def test_parse_cache_rehashes_after_size_or_mtime_change(tmp_path, monkeypatch):
+    reg_path = tmp_path / "policy.reg"
+    reg_file = write_reg_file(reg_path, {POLICY_PATH: {"Enabled": "dword:00000001"}})
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.load(reg_file)
+    hashes = count_hashes(monkeypatch)
+
+    stat = os.stat(reg_file)
+    os.utime(reg_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.load(reg_file)
+    assert cache.last_hit
+    assert len(hashes) == 1
+
+    write_reg_file(reg_path, {POLICY_PATH: {"Enabled": "dword:00000000", "Added": '"new"'}})
+    settings = cache.load(reg_file)
+    assert not cache.last_hit
+    assert len(hashes) == 2
+    assert settings == {POLICY_PATH: {"Enabled": "dword:00000000", "Added": '"new"'}}
+
+def test_parse_cache_hits_copied_file_by_content(tmp_path):
+    reg_file = write_reg_file(tmp_path / "policy.reg", {POLICY_PATH: {"Enabled": "dword:00000001"}})
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.load(reg_file)
+    copied_file = str(tmp_path / "copy.reg")
+    shutil.copyfile(reg_file, copied_file)
+
+    assert cache.load(copied_file) == {POLICY_PATH: {"Enabled": "dword:00000001"}}
+    assert cache.last_hit
+
+def test_parse_cache_evicts_least_recently_used_entry(tmp_path):
+    first_file = write_reg_file(tmp_path / "first.reg", {POLICY_PATH: {"Value": '"first"'}})
+    second_file = write_reg_file(tmp_path / "second.reg", {POLICY_PATH: {"Value": '"other"'}})
+    entry_bytes = len(regUtility.marshal.dumps(regUtility.parse_reg_file(first_file)))
+    cache = ParseCache(str(tmp_path / "cache"), max_bytes=entry_bytes * 3 // 2)
+
+    cache.load(first_file)
+    cache.load(second_file)
+    cache.load(second_file)
+    assert cache.last_hit
+    cache.load(first_file)
+    assert not cache.last_hit
+
+def test_parse_cache_returns_parse_when_cache_dir_is_unwritable(tmp_path):
+    reg_file = write_reg_file(tmp_path / "policy.reg", {POLICY_PATH: {"Enabled": "dword:00000001"}})
+    blocked_dir = tmp_path / "blocked"
+    blocked_dir.write_text("not a directory")
+    cache = ParseCache(str(blocked_dir))
+    messages = []
+
+    for _ in range(2):
+        assert cache.load(reg_file, messages.append) == {POLICY_PATH: {"Enabled": "dword:00000001"}}
+        assert not cache.last_hit
+    assert len(messages) == 2 and messages[0].startswith("Warning: Could not write the parse cache")
+
+def test_parse_merges_repeated_sections_case_insensitively(tmp_path):
+    reg_file = tmp_path / "repeated.reg"
+    reg_file.write_text(
+        "Windows Registry Editor Version 5.00\n\n"
+        "[HKLM\\A]\n"
+        '"Value"="1"\n'
+        '"Other"="x"\n\n'
+        "[HKLM\\B]\n"
+        '"Level"=dword:00000001\n\n'
+        "[hklm\\a]\n"
+        '"VALUE"="2"\n'
+        '"Added"="y"\n',
+        encoding="utf-16",
+    )
+
+    parsed = parse_reg_file(str(reg_file))
+
+    assert parsed == {
+        r"HKLM\A": {"Value": '"2"', "Other": '"x"', "Added": '"y"'},
+        r"HKLM\B": {"Level": "dword:00000001"},
+    }
+    assert list(parsed) == [r"HKLM\A", r"HKLM\B"]
+    assert list(parsed[r"HKLM\A"]) == ["Value", "Other", "Added"]
+
+def test_history_reports_progress_and_limits_drifting_values(tmp_path):
+    history = HistoryStore(str(tmp_path / "history.sqlite3"), batch_size=2)
+    results = [make_status_result(f"Value{index}", ComparisonStatus.DIFFERENT.value) for index in range(5)]
+    progress = []
+
+    run = history.record_run("policy.reg", results, progress_callback=lambda: progress.append(1))
+
+    assert run.changed == 5
+    assert len(progress) >= 2
+    assert [value.key_name for value in history.drifting_values("policy.reg", 2)] == ["Value0", "Value1"]
+    assert len(history.drifting_values("policy.reg")) == 5
+    history.close()